@@ -1,17 +1,28 @@
 #!/usr/bin/env python3
-import aws_cdk as cdk
-from infrastructure_stack import MissionControlStack
+import os
+
+# Skip per-construct stack trace capture in jsii; must be set before aws_cdk is imported.
+os.environ.setdefault("CDK_DISABLE_STACK_TRACE", "1")
+os.environ.setdefault("JSII_SILENCE_WARNING_UNTESTED_NODE_VERSION", "1")
+
+import aws_cdk as cdk  # noqa: E402
+from infrastructure_stack import MissionControlStack  # noqa: E402
 
 app = cdk.App()
 
+# Only pin the stack to an environment when the account is known; a partial
+# env (account=None) leaves the stack half environment-agnostic. Without an
+# account the stack is fully environment-agnostic and deploys to the CLI's
+# region (AWS_REGION / profile), so the us-west-2 default applies only when pinned.
+account = app.node.try_get_context("account") or os.environ.get("CDK_DEFAULT_ACCOUNT")
+region = app.node.try_get_context("region") or os.environ.get("CDK_DEFAULT_REGION") or "us-west-2"
+env = cdk.Environment(account=account, region=region) if account else None
+
 # Development stack
 MissionControlStack(
     app,
     "MissionControlDev",
-    env=cdk.Environment(
-        account=app.node.try_get_context("account"),
-        region=app.node.try_get_context("region") or "us-west-2",
-    ),
+    env=env,
     environment="dev",
 )
 
@@ -19,10 +30,7 @@ MissionControlStack(
 # MissionControlStack(
 #     app,
 #     "MissionControlProd",
-#     env=cdk.Environment(
-#         account=app.node.try_get_context("account"),
-#         region=app.node.try_get_context("region") or "us-west-2"
-#     ),
+#     env=env,
 #     environment="prod"
 # )
 
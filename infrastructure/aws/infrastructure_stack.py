@@ -4,17 +4,65 @@ from aws_cdk import (
     CfnOutput,
     RemovalPolicy,
     Duration,
+    Fn,
     SecretValue,
 )
-from aws_cdk import (
-    aws_ec2 as ec2,
-    aws_rds as rds,
-    aws_elasticache as elasticache,
-    aws_ecs as ecs,
-    aws_ecs_patterns as ecs_patterns,
-    aws_secretsmanager as secretsmanager,
-    aws_logs as logs,
+from aws_cdk.aws_ec2 import (
+    InstanceClass,
+    InstanceSize,
+    InstanceType,
+    Port,
+    SecurityGroup,
+    SubnetConfiguration,
+    SubnetSelection,
+    SubnetType,
+    Vpc,
+)
+from aws_cdk.aws_ecs import (
+    Cluster,
+    ContainerImage,
+    FargateTaskDefinition,
+    LogDrivers,
+    PortMapping,
+    Protocol,
+    Secret as EcsSecret,
+)
+from aws_cdk.aws_ecs_patterns import (
+    ApplicationLoadBalancedFargateService,
+    ApplicationLoadBalancedFargateServiceProtocol,
+)
+from aws_cdk.aws_elasticache import CfnCacheCluster, CfnSubnetGroup
+from aws_cdk.aws_logs import LogGroup, RetentionDays
+from aws_cdk.aws_rds import (
+    Credentials,
+    DatabaseInstance,
+    DatabaseInstanceEngine,
+    PostgresEngineVersion,
 )
+from aws_cdk.aws_secretsmanager import Secret, SecretStringGenerator
+
+# Per-environment sizing, kept as plain values so building a stack only
+# creates jsii objects for the environment actually being synthesized.
+_ENV_CONFIG = {
+    "dev": {
+        "db_instance_class": "T3",
+        "db_instance_size": "MICRO",
+        "cache_node_type": "cache.t3.micro",
+        "fargate_cpu": 512,
+        "fargate_memory": 1024,
+        "desired_count": 1,
+        "log_retention": "ONE_WEEK",
+    },
+    "prod": {
+        "db_instance_class": "T3",
+        "db_instance_size": "SMALL",
+        "cache_node_type": "cache.t3.small",
+        "fargate_cpu": 1024,
+        "fargate_memory": 2048,
+        "desired_count": 2,
+        "log_retention": "ONE_MONTH",
+    },
+}
 
 
 class MissionControlStack(Stack):
@@ -24,62 +72,52 @@ class MissionControlStack(Stack):
         super().__init__(scope, construct_id, **kwargs)
 
         # Configuration based on environment
-        _env_configs = {
-            "dev": {
-                "db_instance_type": ec2.InstanceType.of(
-                    ec2.InstanceClass.T3, ec2.InstanceSize.MICRO
-                ),
-                "cache_node_type": "cache.t3.micro",
-                "fargate_cpu": 512,
-                "fargate_memory": 1024,
-                "desired_count": 1,
-            },
-            "prod": {
-                "db_instance_type": ec2.InstanceType.of(
-                    ec2.InstanceClass.T3, ec2.InstanceSize.SMALL
-                ),
-                "cache_node_type": "cache.t3.small",
-                "fargate_cpu": 1024,
-                "fargate_memory": 2048,
-                "desired_count": 2,
-            },
-        }
-        config = _env_configs.get(environment, _env_configs["dev"])
+        config = _ENV_CONFIG.get(environment, _ENV_CONFIG["dev"])
+        db_instance_type = InstanceType.of(
+            InstanceClass[config["db_instance_class"]],
+            InstanceSize[config["db_instance_size"]],
+        )
+
+        # Subnet tier for the database and Redis (private in prod, public in dev)
+        data_subnet_type = (
+            SubnetType.PRIVATE_WITH_EGRESS if environment == "prod" else SubnetType.PUBLIC
+        )
 
         # VPC
-        vpc = ec2.Vpc(
+        vpc = Vpc(
             self,
             "VPC",
             max_azs=2,
             nat_gateways=1 if environment == "prod" else 0,
             subnet_configuration=[
-                ec2.SubnetConfiguration(
-                    name="Public", subnet_type=ec2.SubnetType.PUBLIC, cidr_mask=24
-                ),
-                ec2.SubnetConfiguration(
+                SubnetConfiguration(name="Public", subnet_type=SubnetType.PUBLIC, cidr_mask=24),
+                SubnetConfiguration(
                     name="Private",
-                    subnet_type=ec2.SubnetType.PRIVATE_WITH_EGRESS
-                    if environment == "prod"
-                    else ec2.SubnetType.PUBLIC,
+                    subnet_type=data_subnet_type,
                     cidr_mask=24,
                 ),
             ],
         )
 
+        # Resolve the data-tier subnet IDs once; each jsii property read is a round trip
+        data_subnets = vpc.private_subnets if environment == "prod" else vpc.public_subnets
+        data_subnet_ids = [subnet.subnet_id for subnet in data_subnets]
+
         # Database credentials secret
-        db_secret = secretsmanager.Secret(
+        db_secret = Secret(
             self,
             "DBSecret",
             secret_name=f"mission-control/{environment}/db-credentials",
-            generate_secret_string=secretsmanager.SecretStringGenerator(
+            generate_secret_string=SecretStringGenerator(
                 secret_string_template='{"username": "postgres"}',
                 generate_string_key="password",
-                exclude_characters="@/\\\"'",
+                # Also URL-reserved characters: the password is spliced into DATABASE_URL
+                exclude_characters="@/\\\"'%:?#[]",
             ),
         )
 
         # RDS PostgreSQL
-        db_security_group = ec2.SecurityGroup(
+        db_security_group = SecurityGroup(
             self,
             "DBSecurityGroup",
             vpc=vpc,
@@ -87,19 +125,15 @@ class MissionControlStack(Stack):
             allow_all_outbound=True,
         )
 
-        database = rds.DatabaseInstance(
+        database = DatabaseInstance(
             self,
             "Database",
-            engine=rds.DatabaseInstanceEngine.postgres(version=rds.PostgresEngineVersion.VER_16),
-            instance_type=config["db_instance_type"],
+            engine=DatabaseInstanceEngine.postgres(version=PostgresEngineVersion.VER_16),
+            instance_type=db_instance_type,
             vpc=vpc,
-            vpc_subnets=ec2.SubnetSelection(
-                subnet_type=ec2.SubnetType.PRIVATE_WITH_EGRESS
-                if environment == "prod"
-                else ec2.SubnetType.PUBLIC
-            ),
+            vpc_subnets=SubnetSelection(subnet_type=data_subnet_type),
             security_groups=[db_security_group],
-            credentials=rds.Credentials.from_secret(db_secret),
+            credentials=Credentials.from_secret(db_secret),
             database_name="mission_control",
             allocated_storage=20,
             max_allocated_storage=100,
@@ -110,7 +144,7 @@ class MissionControlStack(Stack):
         )
 
         # ElastiCache Redis
-        redis_security_group = ec2.SecurityGroup(
+        redis_security_group = SecurityGroup(
             self,
             "RedisSecurityGroup",
             vpc=vpc,
@@ -118,17 +152,14 @@ class MissionControlStack(Stack):
             allow_all_outbound=True,
         )
 
-        redis_subnet_group = elasticache.CfnSubnetGroup(
+        redis_subnet_group = CfnSubnetGroup(
             self,
             "RedisSubnetGroup",
             description="Subnet group for Mission Control Redis",
-            subnet_ids=[
-                subnet.subnet_id
-                for subnet in (vpc.private_subnets if environment == "prod" else vpc.public_subnets)
-            ],
+            subnet_ids=data_subnet_ids,
         )
 
-        redis_cluster = elasticache.CfnCacheCluster(
+        redis_cluster = CfnCacheCluster(
             self,
             "RedisCluster",
             cache_node_type=config["cache_node_type"],
@@ -141,12 +172,10 @@ class MissionControlStack(Stack):
         )
 
         # ECS Cluster
-        cluster = ecs.Cluster(
-            self, "Cluster", vpc=vpc, cluster_name=f"mission-control-{environment}"
-        )
+        cluster = Cluster(self, "Cluster", vpc=vpc, cluster_name=f"mission-control-{environment}")
 
         # Application Security Group
-        app_security_group = ec2.SecurityGroup(
+        app_security_group = SecurityGroup(
             self,
             "AppSecurityGroup",
             vpc=vpc,
@@ -156,24 +185,49 @@ class MissionControlStack(Stack):
 
         # Allow app to connect to DB and Redis
         db_security_group.add_ingress_rule(
-            app_security_group, ec2.Port.tcp(5432), "Allow PostgreSQL access from app"
+            app_security_group, Port.tcp(5432), "Allow PostgreSQL access from app"
         )
         redis_security_group.add_ingress_rule(
-            app_security_group, ec2.Port.tcp(6379), "Allow Redis access from app"
+            app_security_group, Port.tcp(6379), "Allow Redis access from app"
         )
 
         # Application secret for MC_SECRET_KEY
-        app_secret = secretsmanager.Secret(
+        app_secret = Secret(
             self,
             "AppSecret",
             secret_name=f"mission-control/{environment}/app-secret",
+            generate_secret_string=SecretStringGenerator(
+                password_length=64,
+                exclude_punctuation=True,
+            ),
+        )
+
+        # Full database URL, composed by CloudFormation. The password is carried as a
+        # Secrets Manager dynamic reference, so it never appears in the template. It is
+        # a copy taken at deploy time: if the DBSecret password is changed outside a
+        # stack update (e.g. rotated), this URL goes stale until the next deploy.
+        database_url_secret = Secret(
+            self,
+            "DatabaseUrlSecret",
+            secret_name=f"mission-control/{environment}/database-url",
             secret_string_value=SecretValue.unsafe_plain_text(
-                "change-this-in-production-to-a-random-string"
+                Fn.join(
+                    "",
+                    [
+                        "postgresql+asyncpg://postgres:",
+                        db_secret.secret_value_from_json("password").unsafe_unwrap(),
+                        "@",
+                        database.db_instance_endpoint_address,
+                        ":",
+                        database.db_instance_endpoint_port,
+                        "/mission_control",
+                    ],
+                )
             ),
         )
 
         # ECS Task Definition
-        task_definition = ecs.FargateTaskDefinition(
+        task_definition = FargateTaskDefinition(
             self,
             "TaskDef",
             cpu=config["fargate_cpu"],
@@ -181,50 +235,36 @@ class MissionControlStack(Stack):
             family=f"mission-control-{environment}",
         )
 
+        # Application log group
+        log_group = LogGroup(
+            self,
+            "LogGroup",
+            log_group_name=f"/ecs/mission-control-{environment}",
+            retention=RetentionDays[config["log_retention"]],
+        )
+
         # Container
         container = task_definition.add_container(
             "AppContainer",
-            image=ecs.ContainerImage.from_asset("../../"),
-            logging=ecs.LogDrivers.aws_logs(
-                stream_prefix="mission-control",
-                log_group=logs.LogGroup(
-                    self,
-                    "LogGroup",
-                    log_group_name=f"/ecs/mission-control-{environment}",
-                    retention=logs.RetentionDays.ONE_WEEK
-                    if environment == "dev"
-                    else logs.RetentionDays.ONE_MONTH,
-                ),
-            ),
+            image=ContainerImage.from_asset("../../"),
+            logging=LogDrivers.aws_logs(stream_prefix="mission-control", log_group=log_group),
             environment={
                 "MC_DEBUG": "false",
                 "MC_CORS_ORIGINS": '["*"]',  # Restrict in production
+                "MC_REDIS_URL": Fn.join(
+                    "", ["redis://", redis_cluster.attr_redis_endpoint_address, ":6379/0"]
+                ),
             },
             secrets={
-                "MC_DATABASE_URL": ecs.Secret.from_secrets_manager(
-                    db_secret,
-                    field_name="password",
-                    # Construct full URL
-                    # We'll use a custom approach since we need to build the URL
-                ),
-                "MC_SECRET_KEY": ecs.Secret.from_secrets_manager(app_secret),
+                "MC_DATABASE_URL": EcsSecret.from_secrets_manager(database_url_secret),
+                "MC_SECRET_KEY": EcsSecret.from_secrets_manager(app_secret),
             },
         )
 
-        # Manually construct database URL
-        # ECS secrets don't support complex string interpolation, so we'll use a startup script
-        # or environment variable combination in the container
-        container.add_environment("DB_HOST", database.db_instance_endpoint_address)
-        container.add_environment("DB_PORT", "5432")
-        container.add_environment("DB_NAME", "mission_control")
-        container.add_environment("DB_USER", "postgres")
-        container.add_environment("REDIS_HOST", redis_cluster.attr_redis_endpoint_address)
-        container.add_environment("REDIS_PORT", "6379")
-
-        container.add_port_mappings(ecs.PortMapping(container_port=8000, protocol=ecs.Protocol.TCP))
+        container.add_port_mappings(PortMapping(container_port=8000, protocol=Protocol.TCP))
 
         # Fargate Service with Load Balancer
-        service = ecs_patterns.ApplicationLoadBalancedFargateService(
+        service = ApplicationLoadBalancedFargateService(
             self,
             "Service",
             cluster=cluster,
@@ -232,7 +272,7 @@ class MissionControlStack(Stack):
             desired_count=config["desired_count"],
             security_groups=[app_security_group],
             public_load_balancer=True,
-            protocol=ecs_patterns.ApplicationLoadBalancedFargateServiceProtocol.HTTP,  # Use HTTPS in prod with cert
+            protocol=ApplicationLoadBalancedFargateServiceProtocol.HTTP,  # Use HTTPS in prod with cert
             health_check_grace_period=Duration.seconds(60),
         )
 
@@ -9,10 +9,11 @@ from __future__ import annotations
 
 import asyncio
 import signal
+from typing import Any
 
 import structlog
 
-from .config import BridgeConfig
+from .config import AgentConfig, BridgeConfig
 from .health import HealthServer
 from .metrics import MetricsCollector
 from .relay import MessageRelay
@@ -24,6 +25,10 @@ from .subscriptions import SubscriptionManager
 log = structlog.get_logger()
 
 SHUTDOWN_TIMEOUT = 15.0
+LISTENER_STOP_TIMEOUT = 5.0
+OUTBOUND_DRAIN_TIMEOUT = 8.0  # Leaves room within SHUTDOWN_TIMEOUT to close connections
+HEALTH_INTERVAL_SECONDS = 30.0
+HEALTH_DEBOUNCE_SECONDS = 1.0
 
 
 class CommsBridge:
@@ -41,16 +46,27 @@ class CommsBridge:
             verify_tls=config.mission_control.verify_tls,
             request_timeout=config.mission_control.request_timeout_seconds,
             metrics=self._metrics,
+            mc_posts_per_minute=config.mission_control.max_posts_per_minute,
         )
         self._health = HealthServer(
             host=config.metrics.host,
             port=config.metrics.port,
             metrics=self._metrics,
         )
+        self._agents: list[AgentConfig] = []
         self._listeners: list[SSEListener] = []
         self._routers: list[EventRouter] = []
+        # One status dict per started agent, refreshed in place on each health update
+        self._agent_statuses: list[dict[str, Any]] = []
         self._running = False
         self._shutdown_event = asyncio.Event()
+        # Set when a listener connects/disconnects so health refreshes early
+        self._health_dirty = asyncio.Event()
+
+    @property
+    def ready(self) -> bool:
+        """True while running with every agent's SSE stream connected."""
+        return self._running and all(listener.connected for listener in self._listeners)
 
     async def start(self) -> None:
         """Start the bridge: open state, relay, health server, and SSE listeners."""
@@ -70,42 +86,67 @@ class CommsBridge:
             except Exception as exc:
                 log.warning("bridge.health_start_failed", error=str(exc))
 
-        # Start one SSE listener + router per agent
-        for agent_cfg in self._config.agents:
-            api_key = agent_cfg.api_key
-            if not api_key:
-                log.error("bridge.missing_api_key", agent=agent_cfg.name, env=agent_cfg.api_key_env)
-                continue
-
-            subscriptions = SubscriptionManager()
-            router = EventRouter(agent_cfg, self._state, self._relay, subscriptions)
+        # Start one SSE listener + router per agent, concurrently
+        results = await asyncio.gather(
+            *(self._start_agent(agent_cfg) for agent_cfg in self._config.agents),
+            return_exceptions=True,
+        )
+        for agent_cfg, result in zip(self._config.agents, results):
+            if isinstance(result, BaseException):
+                log.error("bridge.agent_start_failed", agent=agent_cfg.name, error=str(result))
+            elif result is not None:
+                listener, router = result
+                self._agents.append(agent_cfg)
+                self._listeners.append(listener)
+                self._routers.append(router)
+                self._agent_statuses.append(
+                    {
+                        "name": agent_cfg.name,
+                        "org": agent_cfg.org_slug,
+                        "sse_connected": False,
+                        "last_event_at": None,
+                        "active_sessions": 0,
+                        "reconnect_count": 0,
+                    }
+                )
 
-            listener = SSEListener(
-                mc_url=self._config.mission_control.url,
-                agent_name=agent_cfg.name,
-                api_key=api_key,
-                org_slug=agent_cfg.org_slug,
-                heartbeat_timeout=self._config.mission_control.sse_heartbeat_timeout_seconds,
-                verify_tls=self._config.mission_control.verify_tls,
-            )
+        self._metrics.set_gauge("sse_connections_active", len(self._listeners))
 
-            # Resume from persisted cursor
-            cursor = await self._state.get_cursor(agent_cfg.name)
-            if cursor:
-                listener.set_last_event_id(cursor)
-                log.info("bridge.resume_cursor", agent=agent_cfg.name, cursor=cursor)
+        self._running = True
+        log.info("bridge.started", agents=len(self._listeners))
 
-            listener.on_event(router.handle_event)
-            await listener.start()
+    async def _start_agent(self, agent_cfg: AgentConfig) -> tuple[SSEListener, EventRouter] | None:
+        """Create the router and SSE listener for one agent and start listening."""
+        api_key = agent_cfg.api_key
+        if not api_key:
+            log.error("bridge.missing_api_key", agent=agent_cfg.name, env=agent_cfg.api_key_env)
+            return None
+
+        subscriptions = SubscriptionManager()
+        router = EventRouter(agent_cfg, self._state, self._relay, subscriptions)
+
+        listener = SSEListener(
+            mc_url=self._config.mission_control.url,
+            agent_name=agent_cfg.name,
+            api_key=api_key,
+            org_slug=agent_cfg.org_slug,
+            heartbeat_timeout=self._config.mission_control.sse_heartbeat_timeout_seconds,
+            verify_tls=self._config.mission_control.verify_tls,
+            batch_context=self._state.batch,
+        )
 
-            self._listeners.append(listener)
-            self._routers.append(router)
+        # Resume from persisted cursor
+        cursor = await self._state.get_cursor(agent_cfg.name)
+        if cursor:
+            listener.set_last_event_id(cursor)
+            log.info("bridge.resume_cursor", agent=agent_cfg.name, cursor=cursor)
 
-            self._metrics.set_gauge("sse_connections_active", len(self._listeners))
-            log.info("bridge.agent_started", agent=agent_cfg.name, org=agent_cfg.org_slug)
+        listener.on_event(router.handle_event)
+        listener.on_status_change(self._health_dirty.set)
+        await listener.start()
 
-        self._running = True
-        log.info("bridge.started", agents=len(self._listeners))
+        log.info("bridge.agent_started", agent=agent_cfg.name, org=agent_cfg.org_slug)
+        return listener, router
 
     async def stop(self) -> None:
         """Graceful shutdown: stop SSE, flush outbound, persist cursors, close connections."""
@@ -115,62 +156,87 @@ class CommsBridge:
         log.info("bridge.stopping")
 
         # 1. Stop SSE listeners
-        for listener in self._listeners:
-            await listener.stop()
+        await asyncio.gather(*(self._stop_listener(listener) for listener in self._listeners))
         log.info("bridge.sse_stopped")
 
-        # 2. Flush outbound
-        flushed = await self._relay.flush_outbound()
+        # 2. Drain outbound, one flush pass at a time, until empty or MC stops taking posts
+        flushed = 0
+        try:
+            async with asyncio.timeout(OUTBOUND_DRAIN_TIMEOUT):
+                while self._relay.outbound_pending:
+                    sent = await self._relay.flush_outbound()
+                    if not sent:
+                        break  # Circuit open or nothing deliverable
+                    flushed += sent
+        except TimeoutError:
+            log.warning("bridge.flush_timeout", pending=self._relay.outbound_pending)
         if flushed:
             log.info("bridge.flushed_outbound", count=flushed)
+        if self._relay.outbound_pending:
+            log.warning("bridge.outbound_dropped", count=self._relay.outbound_pending)
 
         # 3. Close connections
-        await self._health.stop()
-        await self._relay.close()
-        await self._state.close()
+        await asyncio.gather(self._health.stop(), self._relay.close(), self._state.close())
 
         log.info("bridge.stopped")
 
+    async def _stop_listener(self, listener: SSEListener) -> None:
+        try:
+            async with asyncio.timeout(LISTENER_STOP_TIMEOUT):
+                await listener.stop()
+        except TimeoutError:
+            log.warning("bridge.listener_stop_timeout", agent=listener.agent_name)
+
     async def run_forever(self) -> None:
         """Run until shutdown signal."""
-        loop = asyncio.get_event_loop()
+        loop = asyncio.get_running_loop()
 
         for sig in (signal.SIGTERM, signal.SIGINT):
-            loop.add_signal_handler(sig, lambda: self._shutdown_event.set())
+            loop.add_signal_handler(sig, self._request_shutdown)
 
         await self.start()
 
-        # Periodic health status update
+        # Health status update: every HEALTH_INTERVAL_SECONDS, or shortly after
+        # a listener changes connection state (bursts coalesce into one update)
         try:
             while not self._shutdown_event.is_set():
+                self._health_dirty.clear()
                 await self._update_health()
+                if self._relay.outbound_pending:
+                    await self._relay.flush_outbound()
                 try:
-                    await asyncio.wait_for(self._shutdown_event.wait(), timeout=30.0)
-                except asyncio.TimeoutError:
+                    async with asyncio.timeout(HEALTH_INTERVAL_SECONDS):
+                        await self._health_dirty.wait()
+                except TimeoutError:
+                    continue
+                try:
+                    async with asyncio.timeout(HEALTH_DEBOUNCE_SECONDS):
+                        await self._shutdown_event.wait()
+                except TimeoutError:
                     pass
         finally:
-            await asyncio.wait_for(self.stop(), timeout=SHUTDOWN_TIMEOUT)
+            async with asyncio.timeout(SHUTDOWN_TIMEOUT):
+                await self.stop()
+
+    def _request_shutdown(self) -> None:
+        self._shutdown_event.set()
+        self._health_dirty.set()  # Wake the health loop so shutdown is not delayed
 
     async def _update_health(self) -> None:
-        agent_statuses = []
-        for listener, agent_cfg in zip(self._listeners, self._config.agents):
-            sessions = await self._state.list_sessions(agent_cfg.name)
-            agent_statuses.append(
-                {
-                    "name": agent_cfg.name,
-                    "org": agent_cfg.org_slug,
-                    "sse_connected": listener.connected,
-                    "last_event_at": listener.last_event_at,
-                    "active_sessions": len(sessions),
-                    "reconnect_count": listener.reconnect_count,
-                }
-            )
-
-        gw_ok = await self._relay.check_gateway_health()
-        mc_ok = await self._relay.check_mc_health()
+        session_lists, gw_ok, mc_ok = await asyncio.gather(
+            asyncio.gather(*(self._state.list_sessions(agent.name) for agent in self._agents)),
+            self._relay.check_gateway_health(),
+            self._relay.check_mc_health(),
+        )
+
+        for status, listener, sessions in zip(self._agent_statuses, self._listeners, session_lists):
+            status["sse_connected"] = listener.connected
+            status["last_event_at"] = listener.last_event_at
+            status["active_sessions"] = len(sessions)
+            status["reconnect_count"] = listener.reconnect_count
 
         self._metrics.set_gauge(
             "sse_connections_active", sum(1 for listener in self._listeners if listener.connected)
         )
 
-        self._health.update_status(agent_statuses, gw_ok, mc_ok)
+        self._health.update_status(self._agent_statuses, gw_ok, mc_ok)
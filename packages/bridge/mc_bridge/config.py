@@ -1,8 +1,8 @@
 """
 Configuration loading and validation.
 
-Loads bridge configuration from YAML file with environment variable resolution
-for secrets (API keys are never stored in config files).
+Loads bridge configuration from a YAML (or JSON) file with environment variable
+resolution for secrets (API keys are never stored in config files).
 """
 
 from __future__ import annotations
@@ -11,19 +11,32 @@ import os
 from pathlib import Path
 from typing import Literal
 
+import orjson
 import yaml
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _YamlLoader  # type: ignore[assignment]
 
-class MissionControlConfig(BaseModel):
+
+class _ConfigModel(BaseModel):
+    """Base for config sections: immutable once loaded, unknown keys rejected."""
+
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
+
+class MissionControlConfig(_ConfigModel):
     url: str = "http://localhost:8000"
     verify_tls: bool = True
     request_timeout_seconds: int = 30
+    max_posts_per_minute: int = 600
     sse_heartbeat_interval_seconds: int = 30
     sse_heartbeat_timeout_seconds: int = 90
 
 
-class GatewayConfig(BaseModel):
+class GatewayConfig(_ConfigModel):
     url: str = "http://localhost:8080"
     api_key_env: str = "OPENCLAW_GATEWAY_KEY"
 
@@ -32,7 +45,7 @@ class GatewayConfig(BaseModel):
         return os.environ.get(self.api_key_env)
 
 
-class AgentConfig(BaseModel):
+class AgentConfig(_ConfigModel):
     name: str
     api_key_env: str
     org_slug: str
@@ -44,22 +57,22 @@ class AgentConfig(BaseModel):
         return os.environ.get(self.api_key_env)
 
 
-class StateConfig(BaseModel):
+class StateConfig(_ConfigModel):
     db_path: str = "./data/bridge_state.db"
 
 
-class LoggingConfig(BaseModel):
+class LoggingConfig(_ConfigModel):
     level: str = "info"
     format: Literal["json", "text"] = "json"
 
 
-class MetricsConfig(BaseModel):
+class MetricsConfig(_ConfigModel):
     enabled: bool = True
     host: str = "127.0.0.1"
     port: int = 9090
 
 
-class BridgeConfig(BaseModel):
+class BridgeConfig(_ConfigModel):
     mission_control: MissionControlConfig = Field(default_factory=MissionControlConfig)
     gateway: GatewayConfig = Field(default_factory=GatewayConfig)
     agents: list[AgentConfig] = Field(default_factory=list)
@@ -69,12 +82,15 @@ class BridgeConfig(BaseModel):
 
 
 def load_config(path: str | Path) -> BridgeConfig:
-    """Load and validate bridge configuration from a YAML file."""
+    """Load and validate bridge configuration from a YAML or JSON file."""
     path = Path(path)
     if not path.exists():
         raise FileNotFoundError(f"Config file not found: {path}")
 
-    with open(path) as f:
-        raw = yaml.safe_load(f) or {}
+    if path.suffix == ".json":
+        raw = orjson.loads(path.read_bytes()) or {}
+    else:
+        with open(path, "rb") as f:
+            raw = yaml.load(f, Loader=_YamlLoader) or {}
 
     return BridgeConfig.model_validate(raw)
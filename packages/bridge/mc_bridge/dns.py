@@ -0,0 +1,143 @@
+"""
+Cached hostname resolution for outbound HTTP connections.
+
+httpx resolves the MC and Gateway hostnames on every new connection. The bridge
+talks to a handful of fixed hosts, so resolutions are cached for DNS_TTL_SECONDS
+and shared by every client built with ``cached_transport()``. TLS still verifies
+against the original hostname; only the TCP connect target is swapped for the IP.
+
+httpx ignores HTTP(S)_PROXY/NO_PROXY for clients given ``transport=``, so those
+clients also pass ``mounts=proxy_mounts()`` to route proxied hosts as before.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import ipaddress
+import socket
+import time
+import typing
+
+import httpcore
+import httpx
+import structlog
+from httpx._utils import get_environment_proxies
+
+log = structlog.get_logger()
+
+DNS_TTL_SECONDS = 900.0
+
+
+class CachingResolver:
+    """TTL cache over ``loop.getaddrinfo``; serves the stale entry if a refresh fails."""
+
+    def __init__(self, ttl: float = DNS_TTL_SECONDS):
+        self._ttl = ttl
+        self._cache: dict[tuple[str, int], tuple[list[str], float]] = {}
+
+    async def resolve(self, host: str, port: int) -> list[str]:
+        try:
+            ipaddress.ip_address(host)
+            return [host]
+        except ValueError:
+            pass
+
+        key = (host, port)
+        cached = self._cache.get(key)
+        if cached is not None and cached[1] > time.monotonic():
+            return cached[0]
+
+        try:
+            infos = await asyncio.get_running_loop().getaddrinfo(
+                host, port, type=socket.SOCK_STREAM
+            )
+        except OSError:
+            if cached is not None:
+                log.warning("dns.refresh_failed", host=host)
+                return cached[0]
+            raise
+
+        addresses = list(dict.fromkeys(str(info[4][0]) for info in infos))
+        self._cache[key] = (addresses, time.monotonic() + self._ttl)
+        return addresses
+
+    def invalidate(self, host: str, port: int) -> None:
+        self._cache.pop((host, port), None)
+
+
+class CachingNetworkBackend(httpcore.AsyncNetworkBackend):
+    """httpcore backend that connects to cached addresses, trying each in turn."""
+
+    def __init__(self, resolver: CachingResolver, backend: httpcore.AsyncNetworkBackend):
+        self._resolver = resolver
+        self._backend = backend
+
+    async def connect_tcp(
+        self,
+        host: str,
+        port: int,
+        timeout: float | None = None,
+        local_address: str | None = None,
+        socket_options: typing.Iterable[httpcore.SOCKET_OPTION] | None = None,
+    ) -> httpcore.AsyncNetworkStream:
+        try:
+            addresses = await self._resolver.resolve(host, port)
+        except OSError as exc:
+            raise httpcore.ConnectError(str(exc)) from exc
+
+        last_exc: Exception | None = None
+        for address in addresses:
+            try:
+                return await self._backend.connect_tcp(
+                    address,
+                    port,
+                    timeout=timeout,
+                    local_address=local_address,
+                    socket_options=socket_options,
+                )
+            except (httpcore.ConnectError, httpcore.ConnectTimeout) as exc:
+                last_exc = exc
+        # Every cached address failed; resolve afresh on the next attempt
+        self._resolver.invalidate(host, port)
+        assert last_exc
+        raise last_exc
+
+    async def connect_unix_socket(
+        self,
+        path: str,
+        timeout: float | None = None,
+        socket_options: typing.Iterable[httpcore.SOCKET_OPTION] | None = None,
+    ) -> httpcore.AsyncNetworkStream:
+        return await self._backend.connect_unix_socket(
+            path, timeout=timeout, socket_options=socket_options
+        )
+
+    async def sleep(self, seconds: float) -> None:
+        await self._backend.sleep(seconds)
+
+
+# One cache per process, like the system resolver it sits in front of
+_resolver = CachingResolver()
+
+
+def cached_transport(**kwargs: typing.Any) -> httpx.AsyncHTTPTransport:
+    """Build an ``httpx.AsyncHTTPTransport`` whose connections use the shared DNS cache."""
+    transport = httpx.AsyncHTTPTransport(**kwargs)
+    # httpx has no public hook for the network backend, so wrap the one httpcore
+    # picked for this pool; the pool reads it on every connect
+    pool = transport._pool
+    pool._network_backend = CachingNetworkBackend(_resolver, pool._network_backend)
+    return transport
+
+
+def proxy_mounts(**kwargs: typing.Any) -> dict[str, httpx.AsyncBaseTransport | None]:
+    """
+    Proxy transports for the environment's proxy settings, as httpx would mount them.
+
+    ``None`` entries (NO_PROXY hosts) fall through to the client's own transport.
+    Proxied connections go to the proxy, which does its own resolution.
+    """
+    return {
+        pattern: None if proxy is None else httpx.AsyncHTTPTransport(proxy=proxy, **kwargs)
+        for pattern, proxy in get_environment_proxies().items()
+    }
@@ -10,6 +10,7 @@ from __future__ import annotations
 
 from typing import Any
 
+import orjson
 from aiohttp import web
 
 from .metrics import MetricsCollector
@@ -30,6 +31,7 @@ class HealthServer:
         self._agent_statuses: list[dict[str, Any]] = []
         self._gateway_reachable = False
         self._mc_reachable = False
+        self._health_body: bytes | None = None
         self._runner: web.AppRunner | None = None
 
     def update_status(
@@ -41,13 +43,21 @@ class HealthServer:
         self._agent_statuses = agent_statuses
         self._gateway_reachable = gateway_reachable
         self._mc_reachable = mc_reachable
+        self._health_body = None  # Re-serialized on the next /health request
 
     async def start(self) -> None:
         app = web.Application()
         app.router.add_get("/health", self._health_handler)
         app.router.add_get("/metrics", self._metrics_handler)
 
-        self._runner = web.AppRunner(app)
+        # No access log: /metrics is scraped every few seconds and the log line
+        # formatting is pure overhead. Keep-alive lets scrapers reuse connections.
+        self._runner = web.AppRunner(
+            app,
+            access_log=None,
+            keepalive_timeout=75.0,
+            handler_cancellation=True,
+        )
         await self._runner.setup()
         site = web.TCPSite(self._runner, self._host, self._port)
         await site.start()
@@ -57,17 +67,20 @@ class HealthServer:
             await self._runner.cleanup()
 
     async def _health_handler(self, request: web.Request) -> web.Response:
-        status = "healthy" if self._mc_reachable else "degraded"
-        body = {
-            "status": status,
-            "agents": self._agent_statuses,
-            "gateway_reachable": self._gateway_reachable,
-            "mission_control_reachable": self._mc_reachable,
-        }
-        return web.json_response(body)
+        if self._health_body is None:
+            status = "healthy" if self._mc_reachable else "degraded"
+            self._health_body = orjson.dumps(
+                {
+                    "status": status,
+                    "agents": self._agent_statuses,
+                    "gateway_reachable": self._gateway_reachable,
+                    "mission_control_reachable": self._mc_reachable,
+                }
+            )
+        return web.Response(body=self._health_body, content_type="application/json")
 
     async def _metrics_handler(self, request: web.Request) -> web.Response:
         return web.Response(
-            text=self._metrics.to_prometheus(),
+            body=self._metrics.to_prometheus_bytes(),
             content_type="text/plain",
         )
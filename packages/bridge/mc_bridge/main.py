@@ -10,31 +10,49 @@ import argparse
 import asyncio
 import logging
 import sys
+from collections.abc import Coroutine
+from typing import Any
 
+import orjson
 import structlog
 
 from .bridge import CommsBridge
 from .config import load_config
 
+log = structlog.get_logger()
+
 
 def configure_logging(level: str = "info", fmt: str = "json") -> None:
     """Configure structlog with the specified level and format."""
-    processors = [
-        structlog.contextvars.merge_contextvars,
+    processors: list[structlog.typing.Processor] = [
         structlog.processors.add_log_level,
-        structlog.processors.TimeStamper(fmt="iso"),
+        structlog.processors.TimeStamper(fmt="iso", utc=True, key="ts"),
     ]
     if fmt == "json":
-        processors.append(structlog.processors.JSONRenderer())
+        processors.append(structlog.processors.JSONRenderer(serializer=orjson.dumps))
+        logger_factory: Any = structlog.BytesLoggerFactory()
     else:
-        processors.append(structlog.dev.ConsoleRenderer())
+        processors.append(structlog.dev.ConsoleRenderer(timestamp_key="ts"))
+        logger_factory = structlog.PrintLoggerFactory()
 
     structlog.configure(
         processors=processors,
         wrapper_class=structlog.make_filtering_bound_logger(logging.getLevelName(level.upper())),
+        logger_factory=logger_factory,
+        cache_logger_on_first_use=True,
     )
 
 
+def _run_event_loop(main: Coroutine[Any, Any, None]) -> None:
+    """Run the bridge on uvloop when installed, otherwise on the stock asyncio loop."""
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(main)
+    else:
+        uvloop.run(main)
+
+
 def run() -> None:
     """CLI entry point for the bridge."""
     parser = argparse.ArgumentParser(description="OpenClaw ↔ Mission Control Comms Bridge")
@@ -56,12 +74,11 @@ def run() -> None:
         sys.exit(1)
 
     configure_logging(config.logging.level, config.logging.format)
-    log = structlog.get_logger()
     log.info("bridge.config_loaded", config_path=args.config, agents=len(config.agents))
 
     bridge = CommsBridge(config)
     try:
-        asyncio.run(bridge.run_forever())
+        _run_event_loop(bridge.run_forever())
     except KeyboardInterrupt:
         pass
 
@@ -6,10 +6,13 @@ Tracks bridge health counters and gauges for monitoring.
 
 from __future__ import annotations
 
+import sys
 import time
-from collections import defaultdict
+from bisect import insort
 from typing import Any
 
+_UPTIME_PREFIX = b"# TYPE bridge_uptime_seconds gauge\nbridge_uptime_seconds "
+
 
 class MetricsCollector:
     """
@@ -18,45 +21,86 @@ class MetricsCollector:
     Tracks counters and gauges for bridge operations.
     """
 
+    __slots__ = (
+        "_counters",
+        "_gauges",
+        "_start_ns",
+        "_names",
+        "_counter_keys",
+        "_gauge_keys",
+        "_version",
+        "_rendered",
+        "_rendered_version",
+    )
+
     def __init__(self) -> None:
-        self._counters: dict[str, int] = defaultdict(int)
+        self._counters: dict[str, int] = {}
         self._gauges: dict[str, float] = {}
-        self._start_time = time.time()
+        self._start_ns = time.monotonic_ns()
+        # Short name -> interned "bridge_"-prefixed name, built once per metric
+        self._names: dict[str, str] = {}
+        # Metric names kept in exposition order, updated only when a new name appears
+        self._counter_keys: list[str] = []
+        self._gauge_keys: list[str] = []
+        # Exposition text is re-rendered only after a counter or gauge changes
+        self._version = 0
+        self._rendered = b""
+        self._rendered_version = -1
+
+    def _full_name(self, name: str) -> str:
+        full = self._names.get(name)
+        if full is None:
+            full = self._names[name] = sys.intern(f"bridge_{name}")
+        return full
 
     def inc(self, name: str, value: int = 1) -> None:
         """Increment a counter."""
-        self._counters[f"bridge_{name}"] += value
+        full = self._full_name(name)
+        current = self._counters.get(full)
+        if current is None:
+            insort(self._counter_keys, full)
+            current = 0
+        self._counters[full] = current + value
+        self._version += 1
 
     def set_gauge(self, name: str, value: float) -> None:
         """Set a gauge value."""
-        self._gauges[f"bridge_{name}"] = value
+        full = self._full_name(name)
+        if full not in self._gauges:
+            insort(self._gauge_keys, full)
+        self._gauges[full] = value
+        self._version += 1
 
     def get(self, name: str) -> int | float:
         """Get a metric value."""
-        full = f"bridge_{name}"
+        full = self._full_name(name)
         if full in self._gauges:
             return self._gauges[full]
         return self._counters.get(full, 0)
 
     def to_prometheus(self) -> str:
         """Export all metrics in Prometheus text format."""
-        lines = []
-        for name, value in sorted(self._counters.items()):
-            lines.append(f"# TYPE {name} counter")
-            lines.append(f"{name} {value}")
-        for name, value in sorted(self._gauges.items()):
-            lines.append(f"# TYPE {name} gauge")
-            lines.append(f"{name} {value}")
-        # Uptime gauge
-        uptime = time.time() - self._start_time
-        lines.append("# TYPE bridge_uptime_seconds gauge")
-        lines.append(f"bridge_uptime_seconds {uptime:.1f}")
-        return "\n".join(lines) + "\n"
+        return self.to_prometheus_bytes().decode()
+
+    def to_prometheus_bytes(self) -> bytes:
+        """Export all metrics in Prometheus text format as UTF-8 bytes."""
+        if self._rendered_version != self._version:
+            buf = bytearray()
+            for name in self._counter_keys:
+                buf += f"# TYPE {name} counter\n{name} {self._counters[name]}\n".encode()
+            for name in self._gauge_keys:
+                buf += f"# TYPE {name} gauge\n{name} {self._gauges[name]}\n".encode()
+            self._rendered = bytes(buf)
+            self._rendered_version = self._version
+        # Uptime gauge, in whole tenths of a second
+        tenths = (time.monotonic_ns() - self._start_ns) // 100_000_000
+        uptime = f"{tenths // 10}.{tenths % 10}".encode()
+        return b"".join((self._rendered, _UPTIME_PREFIX, uptime, b"\n"))
 
     def to_dict(self) -> dict[str, Any]:
         """Export metrics as a dictionary."""
         return {
             "counters": dict(self._counters),
             "gauges": dict(self._gauges),
-            "uptime_seconds": time.time() - self._start_time,
+            "uptime_seconds": (time.monotonic_ns() - self._start_ns) / 1e9,
         }
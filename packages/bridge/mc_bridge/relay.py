@@ -10,20 +10,101 @@ Handles:
 from __future__ import annotations
 
 import asyncio
+import importlib.util
+import random
 from collections import deque
+from operator import itemgetter
 
 import httpx
+import orjson
 import structlog
 
+from .dns import cached_transport, proxy_mounts
 from .metrics import MetricsCollector
+from .throttle import AIMDLimiter, CircuitBreaker, RateWindow
 
 log = structlog.get_logger()
 
 # Retry configuration
 MAX_RETRIES = 3
 RETRY_BASE_SECONDS = 1.0
+RETRY_MAX_SECONDS = 30.0
 OUTBOUND_BUFFER_MAX = 1000
 
+# Outbound priorities, most valuable first; overflow drops the oldest lowest-priority post
+PRIORITY_COMMAND = 0  # Replies to mc-bridge commands
+PRIORITY_RESPONSE = 1  # Agent responses and command output
+PRIORITY_DIAGNOSTIC = 2
+FLUSH_BATCH_MAX = 100  # Buffered posts sent per flush pass
+FLUSH_CONCURRENCY = 50  # Channels drained in parallel during a flush
+
+# Connection pool shared by MC posts and Gateway calls
+POOL_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50, keepalive_expiry=60)
+CONNECT_TIMEOUT_SECONDS = 5.0
+# Multiplex concurrent requests over one connection when the h2 package is installed
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+# Request bodies are pre-encoded with orjson and sent as content=
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+def _jitter(seconds: float) -> float:
+    """Spread a delay over [seconds/2, seconds] so failed bridges don't retry in lockstep."""
+    return seconds * random.uniform(0.5, 1.0)
+
+
+def _is_congested(resp: httpx.Response) -> bool:
+    return resp.status_code == 429 or resp.status_code >= 500
+
+
+class _BoundedBuffer:
+    """
+    Outbound buffer with one FIFO deque per priority, capped at ``maxlen`` items in total.
+
+    Items are dicts carrying a ``priority`` key. ``popleft`` serves the highest
+    priority first. When full, adding an item evicts the oldest item of the lowest
+    priority present, or the new item itself if everything buffered outranks it.
+    """
+
+    def __init__(self, maxlen: int, levels: int = PRIORITY_DIAGNOSTIC + 1):
+        self._maxlen = maxlen
+        self._levels: list[deque[dict]] = [deque() for _ in range(levels)]
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, item: dict) -> dict | None:
+        """Queue at the back of its priority; returns the dropped item on overflow."""
+        dropped = self._make_room(item)
+        if dropped is not item:
+            self._levels[item["priority"]].append(item)
+            self._size += 1
+        return dropped
+
+    def appendleft(self, item: dict) -> dict | None:
+        """Return an item to the front of its priority; returns the dropped item on overflow."""
+        dropped = self._make_room(item)
+        if dropped is not item:
+            self._levels[item["priority"]].appendleft(item)
+            self._size += 1
+        return dropped
+
+    def popleft(self) -> dict:
+        for level in self._levels:
+            if level:
+                self._size -= 1
+                return level.popleft()
+        raise IndexError("pop from an empty buffer")
+
+    def _make_room(self, item: dict) -> dict | None:
+        if self._size < self._maxlen:
+            return None
+        for priority in range(len(self._levels) - 1, item["priority"] - 1, -1):
+            if self._levels[priority]:
+                self._size -= 1
+                return self._levels[priority].popleft()
+        return item
+
 
 class MessageRelay:
     """
@@ -40,6 +121,7 @@ class MessageRelay:
         verify_tls: bool = True,
         request_timeout: int = 30,
         metrics: MetricsCollector | None = None,
+        mc_posts_per_minute: int = 600,
     ):
         self._mc_url = mc_url.rstrip("/")
         self._gateway_url = gateway_url.rstrip("/")
@@ -47,12 +129,23 @@ class MessageRelay:
         self._request_timeout = request_timeout
         self._metrics = metrics
         self._client: httpx.AsyncClient | None = None
-        self._outbound_buffer: deque = deque(maxlen=OUTBOUND_BUFFER_MAX)
+        self._mc_messages_url = f"{self._mc_url}/api/v1/channels/{{}}/messages"
+        self._mc_auth_headers: dict[str, dict[str, str]] = {}
+        self._outbound_buffer = _BoundedBuffer(OUTBOUND_BUFFER_MAX)
+        # Adaptive cap on concurrent Gateway requests; backs off on 429/5xx/errors
+        self._gateway_limiter = AIMDLimiter()
+        # Paces MC posts ahead of time instead of waiting to be told via 429
+        self._mc_window = RateWindow(mc_posts_per_minute)
+        # Stops posting (and retrying) while MC is down; buffered posts wait for a probe
+        self._mc_breaker = CircuitBreaker()
+        self._flush_slots = asyncio.Semaphore(FLUSH_CONCURRENCY)
 
     async def open(self) -> None:
+        pool_options = {"verify": self._verify_tls, "limits": POOL_LIMITS, "http2": HTTP2_AVAILABLE}
         self._client = httpx.AsyncClient(
-            timeout=httpx.Timeout(self._request_timeout),
-            verify=self._verify_tls,
+            timeout=httpx.Timeout(self._request_timeout, connect=CONNECT_TIMEOUT_SECONDS),
+            transport=cached_transport(**pool_options),
+            mounts=proxy_mounts(**pool_options),
         )
 
     async def close(self) -> None:
@@ -60,26 +153,74 @@ class MessageRelay:
             await self._client.aclose()
             self._client = None
 
+    @property
+    def outbound_pending(self) -> int:
+        return len(self._outbound_buffer)
+
     async def flush_outbound(self) -> int:
-        """Flush any buffered outbound messages. Returns count flushed."""
+        """
+        Flush up to FLUSH_BATCH_MAX buffered outbound messages. Returns count flushed.
+
+        Does nothing while the MC circuit is open. The first message in buffer order
+        (highest priority, oldest within it) is sent on its own as the probe when
+        half-open; once it lands the rest of the batch goes out concurrently, one
+        sequential stream per channel so each channel keeps its message order.
+        Callers that need the buffer emptied call this repeatedly.
+        """
+        if not self._outbound_buffer or not self._mc_breaker.allow():
+            return 0
+        first = self._outbound_buffer.popleft()
+        if not await self._flush_item(first):
+            if self._mc_breaker.state != "closed":
+                self._buffer(first, front=True)  # MC is down, not the message
+            return 0
+
+        batch = [
+            self._outbound_buffer.popleft()
+            for _ in range(min(FLUSH_BATCH_MAX - 1, len(self._outbound_buffer)))
+        ]
+        by_channel: dict[str, list[tuple[int, dict]]] = {}
+        for index, item in enumerate(batch):
+            by_channel.setdefault(item["channel_id"], []).append((index, item))
+
+        requeue: list[tuple[int, dict]] = []
+        counts = await asyncio.gather(
+            *(self._flush_channel(items, requeue) for items in by_channel.values())
+        )
+        # Put unsent messages back at the front in their original order
+        requeue.sort(key=itemgetter(0))
+        for _, item in reversed(requeue):
+            self._buffer(item, front=True)
+        return 1 + sum(counts)
+
+    async def _flush_channel(
+        self, items: list[tuple[int, dict]], requeue: list[tuple[int, dict]]
+    ) -> int:
         flushed = 0
-        while self._outbound_buffer:
-            item = self._outbound_buffer.popleft()
-            try:
-                await self._post_to_mc(
-                    item["channel_id"],
-                    item["content"],
-                    item["sender_id"],
-                    item["sender_name"],
-                    item["api_key"],
-                    item["org_slug"],
-                )
-                flushed += 1
-            except Exception:
-                log.warning("relay.flush_failed", channel_id=item["channel_id"])
-                break
+        async with self._flush_slots:
+            for position, (_, item) in enumerate(items):
+                if self._mc_breaker.state == "closed" and await self._flush_item(item):
+                    flushed += 1
+                elif self._mc_breaker.state != "closed":
+                    requeue.extend(items[position:])
+                    break
         return flushed
 
+    async def _flush_item(self, item: dict) -> bool:
+        try:
+            await self._post_to_mc(
+                item["channel_id"],
+                item["content"],
+                item["sender_id"],
+                item["sender_name"],
+                item["api_key"],
+                item["org_slug"],
+            )
+            return True
+        except Exception:
+            log.warning("relay.flush_failed", channel_id=item["channel_id"])
+            return False
+
     # --- Inbound: MC → Gateway ---
 
     async def forward_to_gateway(
@@ -91,18 +232,19 @@ class MessageRelay:
         """Send a message to the Gateway and return the agent's response."""
         assert self._client
         try:
-            resp = await self._client.post(
-                f"{self._gateway_url}/v1/chat",
-                json={
-                    "session_key": session_key,
-                    "message": message,
-                    "sender": sender,
-                },
-            )
+            async with self._gateway_limiter.slot() as permit:
+                resp = await self._client.post(
+                    f"{self._gateway_url}/v1/chat",
+                    content=orjson.dumps(
+                        {"session_key": session_key, "message": message, "sender": sender}
+                    ),
+                    headers=JSON_HEADERS,
+                )
+                permit.congested = _is_congested(resp)
             resp.raise_for_status()
             if self._metrics:
                 self._metrics.inc("messages_inbound_total")
-            return resp.json().get("response")
+            return orjson.loads(resp.content).get("response")
         except httpx.HTTPStatusError as exc:
             log.error(
                 "relay.gateway_error",
@@ -123,18 +265,19 @@ class MessageRelay:
         """Send a command to the Gateway and return the output."""
         assert self._client
         try:
-            resp = await self._client.post(
-                f"{self._gateway_url}/v1/command",
-                json={
-                    "session_key": session_key,
-                    "command": command,
-                    "args": args,
-                },
-            )
+            async with self._gateway_limiter.slot() as permit:
+                resp = await self._client.post(
+                    f"{self._gateway_url}/v1/command",
+                    content=orjson.dumps(
+                        {"session_key": session_key, "command": command, "args": args}
+                    ),
+                    headers=JSON_HEADERS,
+                )
+                permit.congested = _is_congested(resp)
             resp.raise_for_status()
             if self._metrics:
                 self._metrics.inc("commands_routed_total")
-            return resp.json().get("output")
+            return orjson.loads(resp.content).get("output")
         except httpx.HTTPStatusError as exc:
             log.error(
                 "relay.gateway_command_error",
@@ -156,24 +299,45 @@ class MessageRelay:
         sender_name: str,
         api_key: str,
         org_slug: str,
+        priority: int = PRIORITY_RESPONSE,
     ) -> bool:
         """Post a message to a Mission Control channel with retries."""
-        try:
-            await self._post_to_mc(channel_id, content, sender_id, sender_name, api_key, org_slug)
-            return True
-        except Exception:
-            # Buffer for later flush
-            self._outbound_buffer.append(
-                {
-                    "channel_id": channel_id,
-                    "content": content,
-                    "sender_id": sender_id,
-                    "sender_name": sender_name,
-                    "api_key": api_key,
-                    "org_slug": org_slug,
-                }
+        # While the MC circuit is open, skip the wire and go straight to the buffer
+        if self._mc_breaker.allow():
+            try:
+                await self._post_to_mc(
+                    channel_id, content, sender_id, sender_name, api_key, org_slug
+                )
+                return True
+            except Exception:
+                log.warning("relay.post_buffered", channel_id=channel_id)
+        # Buffer for later flush
+        self._buffer(
+            {
+                "channel_id": channel_id,
+                "content": content,
+                "sender_id": sender_id,
+                "sender_name": sender_name,
+                "api_key": api_key,
+                "org_slug": org_slug,
+                "priority": priority,
+            }
+        )
+        return False
+
+    def _buffer(self, item: dict, front: bool = False) -> None:
+        if front:
+            dropped = self._outbound_buffer.appendleft(item)
+        else:
+            dropped = self._outbound_buffer.append(item)
+        if dropped is not None:
+            log.warning(
+                "relay.outbound_dropped",
+                channel_id=dropped["channel_id"],
+                priority=dropped["priority"],
             )
-            return False
+            if self._metrics:
+                self._metrics.inc("messages_outbound_dropped_total")
 
     async def _post_to_mc(
         self,
@@ -185,34 +349,44 @@ class MessageRelay:
         org_slug: str,
     ) -> None:
         assert self._client
-        url = f"{self._mc_url}/api/v1/channels/{channel_id}/messages"
-        body = {
-            "content": content,
-            "sender_id": sender_id,
-            "sender_name": sender_name,
-        }
-        headers = {"Authorization": f"Bearer {api_key}"}
+        url = self._mc_messages_url.format(channel_id)
+        body = orjson.dumps(
+            {"content": content, "sender_id": sender_id, "sender_name": sender_name}
+        )
+        headers = self._mc_auth_headers.get(api_key)
+        if headers is None:
+            # Shared per API key; never mutated
+            headers = self._mc_auth_headers[api_key] = {
+                "Authorization": f"Bearer {api_key}",
+                **JSON_HEADERS,
+            }
 
         last_exc: Exception | None = None
         for attempt in range(MAX_RETRIES):
             try:
-                resp = await self._client.post(url, json=body, headers=headers)
+                await self._mc_window.acquire()
+                resp = await self._client.post(url, content=body, headers=headers)
+                self._learn_rate_limit(resp)
 
                 if resp.status_code == 429:
-                    retry_after = float(
-                        resp.headers.get("Retry-After", RETRY_BASE_SECONDS * (attempt + 1))
-                    )
+                    header = resp.headers.get("Retry-After")
+                    if header is not None:
+                        retry_after = float(header)
+                    else:
+                        retry_after = _jitter(RETRY_BASE_SECONDS * (attempt + 1))
                     log.warning("relay.rate_limited", retry_after=retry_after)
                     await asyncio.sleep(retry_after)
                     continue
 
                 resp.raise_for_status()
+                self._mc_breaker.record_success()
                 if self._metrics:
                     self._metrics.inc("messages_outbound_total")
                 return
 
             except httpx.HTTPStatusError as exc:
                 if 400 <= exc.response.status_code < 500:
+                    self._mc_breaker.record_success()  # MC is up; the request is at fault
                     log.error(
                         "relay.mc_client_error",
                         status=exc.response.status_code,
@@ -222,10 +396,14 @@ class MessageRelay:
                         self._metrics.inc("messages_outbound_errors_total")
                     raise  # Don't retry 4xx
                 last_exc = exc
-            except (httpx.ConnectError, httpx.ReadError) as exc:
+            except httpx.TransportError as exc:
                 last_exc = exc
 
-            backoff = RETRY_BASE_SECONDS * (2**attempt)
+            self._mc_breaker.record_failure()
+            if self._mc_breaker.state != "closed":
+                break  # Circuit opened: no point spending the remaining attempts
+
+            backoff = _jitter(min(RETRY_MAX_SECONDS, RETRY_BASE_SECONDS * (2**attempt)))
             log.warning(
                 "relay.mc_retry",
                 attempt=attempt + 1,
@@ -234,11 +412,20 @@ class MessageRelay:
             )
             await asyncio.sleep(backoff)
 
+        if last_exc is None:
+            self._mc_breaker.record_failure()  # Rate limited on every attempt
         if self._metrics:
             self._metrics.inc("messages_outbound_errors_total")
         if last_exc:
             raise last_exc
 
+    def _learn_rate_limit(self, resp: httpx.Response) -> None:
+        """Follow an MC-advertised per-minute limit (X-RateLimit-Limit) when present."""
+        advertised = resp.headers.get("X-RateLimit-Limit")
+        if advertised and advertised.isdigit() and int(advertised) != self._mc_window.limit:
+            self._mc_window.set_limit(int(advertised))
+            log.info("relay.mc_rate_limit", limit=int(advertised))
+
     # --- Health ---
 
     async def check_gateway_health(self) -> bool:
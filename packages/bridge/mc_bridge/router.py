@@ -7,18 +7,30 @@ Manages session resolution and self-loop prevention.
 
 from __future__ import annotations
 
+from functools import partial
 from typing import Any
 
 import structlog
 
 from .config import AgentConfig
-from .relay import MessageRelay
+from .relay import PRIORITY_COMMAND, MessageRelay
 from .sse_listener import SSEEvent
 from .state import BridgeState
 from .subscriptions import SubscriptionManager
 
 log = structlog.get_logger()
 
+BRIDGE_COMMAND_PREFIX = "mc-bridge "
+
+
+def _is_bridge_command(content: str) -> bool:
+    """``content.strip().startswith(BRIDGE_COMMAND_PREFIX)`` without copying the message."""
+    i = 0
+    n = len(content)
+    while i < n and content[i].isspace():
+        i += 1
+    return content.startswith(BRIDGE_COMMAND_PREFIX, i)
+
 
 class EventRouter:
     """
@@ -45,6 +57,14 @@ class EventRouter:
         self._subscriptions = subscriptions
         self._sender_id = agent.name.replace("-", "_")
         self._sender_name = agent.name
+        # post_to_mc with this agent's identity bound: (channel_id, content)
+        self._post = partial(
+            relay.post_to_mc,
+            sender_id=self._sender_id,
+            sender_name=self._sender_name,
+            api_key=agent.api_key or "",
+            org_slug=agent.org_slug,
+        )
 
     async def handle_event(self, event: SSEEvent) -> None:
         """Main event dispatch."""
@@ -77,8 +97,8 @@ class EventRouter:
         sender = payload.get("sender_name", "unknown")
 
         # Check for bridge management commands
-        if content.strip().startswith("mc-bridge "):
-            await self._handle_bridge_command(channel_id, content.strip())
+        if _is_bridge_command(content):
+            await self._handle_bridge_command(channel_id, content)
             return
 
         session_key = await self._resolve_session(channel_id)
@@ -91,14 +111,7 @@ class EventRouter:
 
         response = await self._relay.forward_to_gateway(session_key, content, sender)
         if response:
-            await self._relay.post_to_mc(
-                channel_id,
-                response,
-                self._sender_id,
-                self._sender_name,
-                self._agent.api_key or "",
-                self._agent.org_slug,
-            )
+            await self._post(channel_id, response)
 
     async def _handle_command(self, payload: dict[str, Any]) -> None:
         if payload.get("sender_id") == self._sender_id:
@@ -118,14 +131,7 @@ class EventRouter:
 
         output = await self._relay.forward_command_to_gateway(session_key, command, args)
         if output:
-            await self._relay.post_to_mc(
-                channel_id,
-                output,
-                self._sender_id,
-                self._sender_name,
-                self._agent.api_key or "",
-                self._agent.org_slug,
-            )
+            await self._post(channel_id, output)
 
     async def _handle_bridge_command(self, channel_id: str, text: str) -> None:
         """Handle mc-bridge commands (e.g., mc-bridge subscribe {topic})."""
@@ -137,25 +143,15 @@ class EventRouter:
         if subcmd == "subscribe" and len(parts) >= 3:
             topic = parts[2]
             self._subscriptions.subscribe(topic)
-            await self._relay.post_to_mc(
-                channel_id,
-                f"✅ Subscribed to topic: {topic}",
-                self._sender_id,
-                self._sender_name,
-                self._agent.api_key or "",
-                self._agent.org_slug,
+            await self._post(
+                channel_id, f"✅ Subscribed to topic: {topic}", priority=PRIORITY_COMMAND
             )
             log.info("router.subscribe", topic=topic)
         elif subcmd == "unsubscribe" and len(parts) >= 3:
             topic = parts[2]
             self._subscriptions.unsubscribe(topic)
-            await self._relay.post_to_mc(
-                channel_id,
-                f"✅ Unsubscribed from topic: {topic}",
-                self._sender_id,
-                self._sender_name,
-                self._agent.api_key or "",
-                self._agent.org_slug,
+            await self._post(
+                channel_id, f"✅ Unsubscribed from topic: {topic}", priority=PRIORITY_COMMAND
             )
             log.info("router.unsubscribe", topic=topic)
         elif subcmd == "subscriptions":
@@ -165,14 +161,7 @@ class EventRouter:
                 if topics
                 else "No active subscriptions."
             )
-            await self._relay.post_to_mc(
-                channel_id,
-                msg,
-                self._sender_id,
-                self._sender_name,
-                self._agent.api_key or "",
-                self._agent.org_slug,
-            )
+            await self._post(channel_id, msg, priority=PRIORITY_COMMAND)
 
     async def _handle_assignment(self, payload: dict[str, Any]) -> None:
         """Handle project.user_assigned: create session mapping."""
@@ -225,18 +214,10 @@ class EventRouter:
 
     async def _resolve_session(self, channel_id: str) -> str:
         """Get or create session key for a channel."""
-        existing = await self._state.get_session_key(channel_id, self._agent.name)
-        if existing:
-            return existing
-
         # Default to project-style session key
-        session_key = f"mc:{self._agent.org_slug}:project:{channel_id}"
-        await self._state.create_session_mapping(
-            session_key,
-            self._agent.name,
-            self._agent.org_slug,
-            channel_id,
-            "project",
+        session_key, created = await self._state.get_or_create_session_key(
+            channel_id, self._agent.name, self._agent.org_slug, "project"
         )
-        log.info("router.session_created", channel=channel_id[:8], session=session_key)
+        if created:
+            log.info("router.session_created", channel=channel_id[:8], session=session_key)
         return session_key
@@ -11,23 +11,31 @@ Maintains a persistent SSE connection per agent with:
 from __future__ import annotations
 
 import asyncio
-import json
+import contextlib
+import random
 import time
 from dataclasses import dataclass
 from typing import Any, Callable, Coroutine
 
 import httpx
+import orjson
 import structlog
 
+from .dns import cached_transport, proxy_mounts
+
 log = structlog.get_logger()
 
 # Reconnection parameters
 RECONNECT_BASE_SECONDS = 1.0
 RECONNECT_MAX_SECONDS = 60.0
 RECONNECT_MULTIPLIER = 2.0
+# Parsed events waiting for handlers; when full, the read loop waits for room
+DISPATCH_QUEUE_MAX = 256
+# Most events handled under one batch context (e.g. one state commit)
+DISPATCH_BATCH_MAX = 64
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class SSEEvent:
     """A parsed SSE event."""
 
@@ -38,6 +46,8 @@ class SSEEvent:
 
 
 EventHandler = Callable[[SSEEvent], Coroutine[Any, Any, None]]
+StatusCallback = Callable[[], None]
+BatchContext = Callable[[], contextlib.AbstractAsyncContextManager[Any]]
 
 
 class SSEListener:
@@ -55,6 +65,7 @@ class SSEListener:
         org_slug: str,
         heartbeat_timeout: float = 90.0,
         verify_tls: bool = True,
+        batch_context: BatchContext = contextlib.nullcontext,
     ):
         self._mc_url = mc_url.rstrip("/")
         self._agent_name = agent_name
@@ -62,14 +73,25 @@ class SSEListener:
         self._org_slug = org_slug
         self._heartbeat_timeout = heartbeat_timeout
         self._verify_tls = verify_tls
+        # Wraps each batch of dispatched events, e.g. BridgeState.batch to share one commit
+        self._batch_context = batch_context
 
         self._handlers: list[EventHandler] = []
+        self._status_callbacks: list[StatusCallback] = []
         self._running = False
         self._connected = False
         self._last_event_at: float | None = None
         self._last_event_id: str | None = None
         self._reconnect_count = 0
         self._task: asyncio.Task | None = None
+        self._client: httpx.AsyncClient | None = None
+        # Handlers run in a separate task so a slow one doesn't stall the stream read
+        self._queue: asyncio.Queue[SSEEvent] = asyncio.Queue(maxsize=DISPATCH_QUEUE_MAX)
+        self._dispatch_task: asyncio.Task | None = None
+
+    @property
+    def agent_name(self) -> str:
+        return self._agent_name
 
     @property
     def connected(self) -> bool:
@@ -87,6 +109,17 @@ class SSEListener:
         """Register an event handler."""
         self._handlers.append(handler)
 
+    def on_status_change(self, callback: StatusCallback) -> None:
+        """Register a callback invoked whenever the connection state flips."""
+        self._status_callbacks.append(callback)
+
+    def _set_connected(self, connected: bool) -> None:
+        if connected == self._connected:
+            return
+        self._connected = connected
+        for callback in self._status_callbacks:
+            callback()
+
     def set_last_event_id(self, event_id: str) -> None:
         """Set the cursor for SSE resume (from persisted state)."""
         self._last_event_id = event_id
@@ -94,18 +127,46 @@ class SSEListener:
     async def start(self) -> None:
         """Start the SSE listener loop."""
         self._running = True
+        # One client for the listener's lifetime so reconnects reuse pooled connections
+        limits = httpx.Limits(max_keepalive_connections=1, keepalive_expiry=30.0)
+        self._client = httpx.AsyncClient(
+            timeout=httpx.Timeout(None, connect=10.0),
+            transport=cached_transport(verify=self._verify_tls, limits=limits),
+            mounts=proxy_mounts(verify=self._verify_tls, limits=limits),
+        )
+        self._start_dispatch_worker()
         self._task = asyncio.create_task(self._listen_loop())
 
+    def _start_dispatch_worker(self) -> None:
+        self._dispatch_task = asyncio.create_task(self._dispatch_worker())
+        self._dispatch_task.add_done_callback(self._on_dispatch_worker_done)
+
+    def _on_dispatch_worker_done(self, task: asyncio.Task) -> None:
+        # A dead worker would let the queue fill and block the stream reader forever
+        if task.cancelled() or not self._running:
+            return
+        log.error(
+            "sse_listener.dispatch_worker_died",
+            agent=self._agent_name,
+            exc_info=task.exception(),
+        )
+        self._start_dispatch_worker()
+
     async def stop(self) -> None:
         """Gracefully stop the SSE listener."""
         self._running = False
-        if self._task:
-            self._task.cancel()
-            try:
-                await self._task
-            except asyncio.CancelledError:
-                pass
-        self._connected = False
+        # Events still queued were not cursor-saved, so they replay on the next start
+        for task in (self._task, self._dispatch_task):
+            if task:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        if self._client:
+            await self._client.aclose()
+            self._client = None
+        self._set_connected(False)
         log.info("sse_listener.stopped", agent=self._agent_name)
 
     async def _listen_loop(self) -> None:
@@ -114,11 +175,12 @@ class SSEListener:
         while self._running:
             try:
                 await self._connect_and_stream()
+                self._set_connected(False)
                 backoff = RECONNECT_BASE_SECONDS  # Reset on clean disconnect
             except asyncio.CancelledError:
                 raise
             except Exception as exc:
-                self._connected = False
+                self._set_connected(False)
                 log.warning(
                     "sse_listener.connection_lost",
                     agent=self._agent_name,
@@ -130,13 +192,15 @@ class SSEListener:
                 break
 
             self._reconnect_count += 1
+            # Jittered so listeners dropped by the same outage reconnect spread out
+            delay = backoff * random.uniform(0.5, 1.0)
             log.info(
                 "sse_listener.reconnecting",
                 agent=self._agent_name,
-                backoff=backoff,
+                backoff=delay,
                 attempt=self._reconnect_count,
             )
-            await asyncio.sleep(backoff)
+            await asyncio.sleep(delay)
             backoff = min(backoff * RECONNECT_MULTIPLIER, RECONNECT_MAX_SECONDS)
 
     async def _connect_and_stream(self) -> None:
@@ -149,62 +213,71 @@ class SSEListener:
 
         url = f"{self._mc_url}/api/v1/orgs/{self._org_slug}/events/stream"
 
-        async with httpx.AsyncClient(
-            timeout=httpx.Timeout(None),
-            verify=self._verify_tls,
-        ) as client:
-            async with client.stream("GET", url, headers=headers) as response:
-                response.raise_for_status()
-                self._connected = True
-                self._last_event_at = time.time()
-                log.info(
-                    "sse_listener.connected",
-                    agent=self._agent_name,
-                    url=url,
-                    resume_from=self._last_event_id,
-                )
+        assert self._client
+        async with self._client.stream("GET", url, headers=headers) as response:
+            response.raise_for_status()
+            self._set_connected(True)
+            self._last_event_at = time.time()
+            log.info(
+                "sse_listener.connected",
+                agent=self._agent_name,
+                url=url,
+                resume_from=self._last_event_id,
+            )
+
+            current_event_type: str | None = None
+            current_event_id: str | None = None
+            current_data = bytearray()
+            buffer = bytearray()
 
-                current_event_type: str | None = None
-                current_event_id: str | None = None
-                current_data_lines: list[str] = []
-
-                async for line in response.aiter_lines():
-                    if not self._running:
-                        break
-
-                    line = line.rstrip("\n")
-                    self._last_event_at = time.time()
-
-                    if line.startswith("event:"):
-                        current_event_type = line[6:].strip()
-                    elif line.startswith("id:"):
-                        current_event_id = line[3:].strip()
-                    elif line.startswith("data:"):
-                        current_data_lines.append(line[5:].strip())
-                    elif line.startswith(":"):
-                        # Comment / keepalive
-                        pass
-                    elif line == "":
+            # Parse raw bytes: split lines ourselves and branch on the first byte,
+            # decoding only the event/id values and the joined data at dispatch.
+            async for chunk in response.aiter_bytes():
+                if not self._running:
+                    break
+
+                self._last_event_at = time.time()
+                buffer += chunk
+                start = 0
+                while (end := buffer.find(b"\n", start)) >= 0:
+                    line = bytes(buffer[start:end])
+                    start = end + 1
+                    if line.endswith(b"\r"):
+                        line = line[:-1]
+
+                    if not line:
                         # End of event — dispatch
-                        if current_data_lines:
+                        if current_data:
                             await self._dispatch_event(
-                                current_event_type, current_event_id, current_data_lines
+                                current_event_type, current_event_id, current_data
                             )
                         current_event_type = None
                         current_event_id = None
-                        current_data_lines = []
+                        current_data = bytearray()
+                        continue
+
+                    first = line[0]
+                    if first == 0x64 and line.startswith(b"data:"):  # "d"
+                        if current_data:
+                            current_data.append(0x0A)  # Multi-line data joins with "\n"
+                        current_data += line[5:].strip()
+                    elif first == 0x65 and line.startswith(b"event:"):  # "e"
+                        current_event_type = line[6:].strip().decode()
+                    elif first == 0x69 and line.startswith(b"id:"):  # "i"
+                        current_event_id = line[3:].strip().decode()
+                    # ":" comments / keepalives and unknown fields are ignored
+                del buffer[:start]
 
     async def _dispatch_event(
         self,
         event_type: str | None,
         event_id: str | None,
-        data_lines: list[str],
+        raw: bytearray,
     ) -> None:
-        data_str = "\n".join(data_lines)
         try:
-            data = json.loads(data_str)
-        except json.JSONDecodeError:
-            log.warning("sse_listener.parse_error", data=data_str[:200])
+            data = orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            log.warning("sse_listener.parse_error", data=raw[:200].decode(errors="replace"))
             return
 
         resolved_type = event_type or data.get("type", "unknown")
@@ -223,12 +296,51 @@ class SSEListener:
         if event_id:
             self._last_event_id = event_id
 
-        for handler in self._handlers:
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            log.warning("sse_listener.dispatch_backlog", agent=self._agent_name)
+            await self._queue.put(event)
+
+    async def _dispatch_worker(self) -> None:
+        """Run handlers for queued events in order; an event's handlers run concurrently."""
+        while True:
+            # Take whatever has piled up (a replay burst after reconnect) as one batch
+            events = [await self._queue.get()]
+            while len(events) < DISPATCH_BATCH_MAX and not self._queue.empty():
+                events.append(self._queue.get_nowait())
+            try:
+                async with self._batch_context():
+                    for event in events:
+                        await self._run_handlers(event)
+            except Exception:
+                # e.g. the batch commit failed; handlers already ran, keep consuming
+                log.exception(
+                    "sse_listener.dispatch_batch_error",
+                    agent=self._agent_name,
+                    events=len(events),
+                )
+
+    async def _run_handlers(self, event: SSEEvent) -> None:
+        if len(self._handlers) == 1:
             try:
-                await handler(event)
+                await self._handlers[0](event)
             except Exception:
                 log.exception(
                     "sse_listener.handler_error",
                     agent=self._agent_name,
-                    event_type=resolved_type,
+                    event_type=event.event_type,
+                )
+            return
+
+        results = await asyncio.gather(
+            *(handler(event) for handler in self._handlers), return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                log.error(
+                    "sse_listener.handler_error",
+                    agent=self._agent_name,
+                    event_type=event.event_type,
+                    exc_info=result,
                 )
@@ -8,10 +8,23 @@ Stores:
 
 from __future__ import annotations
 
+import asyncio
+import contextlib
+import contextvars
 import os
-from datetime import datetime, timezone
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator
 
 import aiosqlite
+import structlog
+
+log = structlog.get_logger()
+
+# Cursor saves are buffered in memory and written at most this often
+CURSOR_FLUSH_INTERVAL = 1.0
+# Bound on the in-memory (channel_id, agent_id) -> session_key lookup cache
+SESSION_CACHE_SIZE = 4096
 
 _SCHEMA = """
 CREATE TABLE IF NOT EXISTS session_mappings (
@@ -41,29 +54,89 @@ class BridgeState:
     def __init__(self, db_path: str):
         self._db_path = db_path
         self._db: aiosqlite.Connection | None = None
+        # agent_id -> (org_slug, sequence_id, updated_at) awaiting the next flush
+        self._pending_cursors: dict[str, tuple[str, str, str]] = {}
+        self._flush_task: asyncio.Task | None = None
+        # LRU of session lookups, plus session_key -> cache key for eviction
+        self._session_cache: OrderedDict[tuple[str, str], str] = OrderedDict()
+        self._session_cache_keys: dict[str, tuple[str, str]] = {}
+        # Formatted "YYYY-MM-DDTHH:MM:SS" for the current second, reused by _utc_now()
+        self._ts_second = -1
+        self._ts_prefix = ""
+        # Open batch() blocks in the current task; its session writes skip their own
+        # commit while non-zero. Per task, so one worker's batch never defers another's
+        self._batch_depth: contextvars.ContextVar[int] = contextvars.ContextVar(
+            "batch_depth", default=0
+        )
+
+    def _utc_now(self) -> str:
+        """UTC ISO 8601 timestamp; the date/time part is only formatted once per second."""
+        now = time.time()
+        second = int(now)
+        if second != self._ts_second:
+            self._ts_prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second))
+            self._ts_second = second
+        return f"{self._ts_prefix}.{int((now - second) * 1_000_000):06d}+00:00"
 
     async def open(self) -> None:
         os.makedirs(os.path.dirname(self._db_path) or ".", exist_ok=True)
         self._db = await aiosqlite.connect(self._db_path)
         self._db.row_factory = aiosqlite.Row
+        await self._db.execute("PRAGMA journal_mode=WAL")
+        await self._db.execute("PRAGMA synchronous=NORMAL")
         await self._db.executescript(_SCHEMA)
         await self._db.commit()
+        self._flush_task = asyncio.create_task(self._flush_loop())
 
     async def close(self) -> None:
+        if self._flush_task:
+            self._flush_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._flush_task
+            self._flush_task = None
         if self._db:
+            await self.flush_cursors()
             await self._db.close()
             self._db = None
 
+    @contextlib.asynccontextmanager
+    async def batch(self) -> AsyncIterator[None]:
+        """
+        Defer this task's session-mapping commits until its outermost batch exits,
+        then commit once. Batches opened by other tasks do not affect it.
+        """
+        depth = self._batch_depth.get()
+        self._batch_depth.set(depth + 1)
+        try:
+            yield
+        finally:
+            self._batch_depth.set(depth)
+            if not depth and self._db:
+                await self._db.commit()
+
+    async def _commit(self) -> None:
+        assert self._db
+        if not self._batch_depth.get():
+            await self._db.commit()
+
     # --- Session Mappings ---
 
     async def get_session_key(self, channel_id: str, agent_id: str) -> str | None:
         assert self._db
+        cached = self._session_cache.get((channel_id, agent_id))
+        if cached is not None:
+            self._session_cache.move_to_end((channel_id, agent_id))
+            return cached
+
         cursor = await self._db.execute(
             "SELECT session_key FROM session_mappings WHERE channel_id = ? AND agent_id = ?",
             (channel_id, agent_id),
         )
         row = await cursor.fetchone()
-        return row["session_key"] if row else None
+        if not row:
+            return None
+        self._cache_session(row["session_key"], channel_id, agent_id)
+        return row["session_key"]
 
     async def get_channel_id(self, session_key: str) -> str | None:
         assert self._db
@@ -83,32 +156,88 @@ class BridgeState:
         channel_type: str = "project",
     ) -> None:
         assert self._db
-        now = datetime.now(timezone.utc).isoformat()
+        now = self._utc_now()
         await self._db.execute(
             """INSERT OR REPLACE INTO session_mappings
                (session_key, agent_id, org_slug, channel_id, channel_type, created_at)
                VALUES (?, ?, ?, ?, ?, ?)""",
             (session_key, agent_id, org_slug, channel_id, channel_type, now),
         )
-        await self._db.commit()
+        await self._commit()
+        self._cache_session(session_key, channel_id, agent_id)
+
+    async def get_or_create_session_key(
+        self,
+        channel_id: str,
+        agent_id: str,
+        org_slug: str,
+        channel_type: str = "project",
+    ) -> tuple[str, bool]:
+        """
+        Resolve the session key for a channel, creating the mapping if needed.
+
+        Returns ``(session_key, created)``. An existing mapping for the channel wins,
+        whatever its key (assignments and sub-agents map channels to their own keys);
+        only a channel with no mapping gets the default key. Cache hits cost no SQL.
+        """
+        existing = await self.get_session_key(channel_id, agent_id)
+        if existing is not None:
+            return existing, False
+
+        assert self._db
+        session_key = f"mc:{org_slug}:{channel_type}:{channel_id}"
+        cursor = await self._db.execute(
+            """INSERT INTO session_mappings
+               (session_key, agent_id, org_slug, channel_id, channel_type, created_at)
+               VALUES (?, ?, ?, ?, ?, ?)
+               ON CONFLICT(session_key) DO NOTHING""",
+            (session_key, agent_id, org_slug, channel_id, channel_type, self._utc_now()),
+        )
+        created = cursor.rowcount == 1
+        await self._commit()
+        if created:
+            self._cache_session(session_key, channel_id, agent_id)
+        return session_key, created
 
     async def delete_session_mapping(self, session_key: str) -> None:
         assert self._db
         await self._db.execute("DELETE FROM session_mappings WHERE session_key = ?", (session_key,))
-        await self._db.commit()
+        await self._commit()
+        self._evict_session(session_key)
 
-    async def list_sessions(self, agent_id: str) -> list[dict]:
+    def _cache_session(self, session_key: str, channel_id: str, agent_id: str) -> None:
+        self._evict_session(session_key)  # The key may have been remapped to another channel
+        key = (channel_id, agent_id)
+        displaced = self._session_cache.get(key)
+        if displaced is not None:
+            self._session_cache_keys.pop(displaced, None)
+        self._session_cache[key] = session_key
+        self._session_cache.move_to_end(key)
+        self._session_cache_keys[session_key] = key
+        if len(self._session_cache) > SESSION_CACHE_SIZE:
+            _, oldest = self._session_cache.popitem(last=False)
+            self._session_cache_keys.pop(oldest, None)
+
+    def _evict_session(self, session_key: str) -> None:
+        key = self._session_cache_keys.pop(session_key, None)
+        if key is not None:
+            self._session_cache.pop(key, None)
+
+    async def list_sessions(self, agent_id: str) -> list[aiosqlite.Row]:
+        """Session mappings for an agent, as rows (mapping-style access: row["channel_id"])."""
         assert self._db
         cursor = await self._db.execute(
             "SELECT * FROM session_mappings WHERE agent_id = ?", (agent_id,)
         )
-        rows = await cursor.fetchall()
-        return [dict(r) for r in rows]
+        return list(await cursor.fetchall())
 
     # --- Event Cursors ---
 
     async def get_cursor(self, agent_id: str) -> str | None:
         assert self._db
+        pending = self._pending_cursors.get(agent_id)
+        if pending:
+            return pending[1]
         cursor = await self._db.execute(
             "SELECT last_sequence_id FROM event_cursors WHERE agent_id = ?",
             (agent_id,),
@@ -117,12 +246,36 @@ class BridgeState:
         return row["last_sequence_id"] if row else None
 
     async def save_cursor(self, agent_id: str, org_slug: str, sequence_id: str) -> None:
+        """Record the agent's latest cursor; written to disk by the next flush."""
+        now = self._utc_now()
+        self._pending_cursors[agent_id] = (org_slug, sequence_id, now)
+
+    async def flush_cursors(self) -> None:
+        """Write all buffered cursors in a single transaction."""
         assert self._db
-        now = datetime.now(timezone.utc).isoformat()
-        await self._db.execute(
-            """INSERT INTO event_cursors (agent_id, org_slug, last_sequence_id, updated_at)
-               VALUES (?, ?, ?, ?)
-               ON CONFLICT(agent_id) DO UPDATE SET last_sequence_id=?, updated_at=?""",
-            (agent_id, org_slug, sequence_id, now, sequence_id, now),
-        )
-        await self._db.commit()
+        if not self._pending_cursors:
+            return
+        pending, self._pending_cursors = self._pending_cursors, {}
+        try:
+            await self._db.executemany(
+                """INSERT INTO event_cursors (agent_id, org_slug, last_sequence_id, updated_at)
+                   VALUES (?, ?, ?, ?)
+                   ON CONFLICT(agent_id) DO UPDATE SET
+                       last_sequence_id=excluded.last_sequence_id,
+                       updated_at=excluded.updated_at""",
+                [(agent_id, *cursor) for agent_id, cursor in pending.items()],
+            )
+            await self._db.commit()
+        except Exception:
+            # Keep unsaved cursors for the next attempt unless a newer one arrived
+            for agent_id, cursor in pending.items():
+                self._pending_cursors.setdefault(agent_id, cursor)
+            raise
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(CURSOR_FLUSH_INTERVAL)
+            try:
+                await self.flush_cursors()
+            except Exception:
+                log.exception("state.cursor_flush_failed")
@@ -16,24 +16,24 @@ class SubscriptionManager:
     """Manages topic subscriptions for an agent."""
 
     def __init__(self) -> None:
-        self._topics: set[str] = set()
+        # Copy-on-write snapshot: writers publish a new frozenset, readers never lock
+        self._topics: frozenset[str] = frozenset()
 
     def subscribe(self, topic: str) -> None:
-        self._topics.add(topic)
+        self._topics = self._topics | {topic}
         log.info("subscriptions.added", topic=topic)
 
     def unsubscribe(self, topic: str) -> None:
-        self._topics.discard(topic)
+        self._topics = self._topics - {topic}
         log.info("subscriptions.removed", topic=topic)
 
     def is_subscribed(self, topic: str) -> bool:
         # If no topics set, accept all (auto-subscribe mode)
-        if not self._topics:
-            return True
-        return topic in self._topics
+        topics = self._topics
+        return not topics or topic in topics
 
     def list_topics(self) -> list[str]:
         return sorted(self._topics)
 
     def set_topics(self, topics: list[str]) -> None:
-        self._topics = set(topics)
+        self._topics = frozenset(topics)
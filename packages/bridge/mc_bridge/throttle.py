@@ -0,0 +1,180 @@
+"""
+Client-side flow control for outbound requests.
+
+Provides:
+- AIMDLimiter: adaptive concurrency limit (additive increase, multiplicative decrease)
+- RateWindow: sliding-window request pacing (e.g. requests per minute)
+- CircuitBreaker: stop sending to a peer that keeps failing, probe it after a cooldown
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+
+
+@dataclass(slots=True)
+class Permit:
+    """Handle for one in-flight request; set ``congested`` to report overload."""
+
+    congested: bool = False
+
+
+class AIMDLimiter:
+    """
+    Adaptive concurrency limiter.
+
+    The limit grows by ``increase`` after each fast success (mean latency over the
+    last ``window`` requests at or under ``target_latency``) and is multiplied by
+    ``decrease`` when a request reports congestion or fails with an exception.
+    """
+
+    def __init__(
+        self,
+        initial: float = 8.0,
+        minimum: float = 1.0,
+        maximum: float = 64.0,
+        target_latency: float = 0.5,
+        window: int = 32,
+        increase: float = 0.5,
+        decrease: float = 0.5,
+    ):
+        self._limit = initial
+        self._minimum = minimum
+        self._maximum = maximum
+        self._target_latency = target_latency
+        self._increase = increase
+        self._decrease = decrease
+        self._latencies: deque[float] = deque(maxlen=window)
+        self._in_flight = 0
+        self._cond = asyncio.Condition()
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[Permit]:
+        """Wait for capacity, then hold one slot for the duration of the block."""
+        async with self._cond:
+            await self._cond.wait_for(lambda: self._in_flight < int(self._limit))
+            self._in_flight += 1
+
+        permit = Permit()
+        started = time.monotonic()
+        try:
+            yield permit
+        except Exception:
+            permit.congested = True
+            raise
+        finally:
+            async with self._cond:
+                self._in_flight -= 1
+                if permit.congested:
+                    self._limit = max(self._minimum, self._limit * self._decrease)
+                else:
+                    self._latencies.append(time.monotonic() - started)
+                    mean = sum(self._latencies) / len(self._latencies)
+                    if mean <= self._target_latency:
+                        self._limit = min(self._maximum, self._limit + self._increase)
+                self._cond.notify_all()
+
+
+class RateWindow:
+    """
+    Sliding-window rate limiter: at most ``limit`` acquisitions per ``period`` seconds.
+
+    Callers wait before sending rather than discovering the limit via a 429.
+    """
+
+    def __init__(self, limit: int, period: float = 60.0):
+        self._limit = max(1, limit)
+        self._period = period
+        self._stamps: deque[float] = deque()
+        self._lock = asyncio.Lock()
+
+    @property
+    def limit(self) -> int:
+        return self._limit
+
+    def set_limit(self, limit: int) -> None:
+        """Adjust the limit, e.g. from a server-advertised rate limit header."""
+        self._limit = max(1, limit)
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            loop = asyncio.get_running_loop()
+            while True:
+                now = loop.time()
+                while self._stamps and now - self._stamps[0] >= self._period:
+                    self._stamps.popleft()
+                if len(self._stamps) < self._limit:
+                    break
+                await asyncio.sleep(self._period - (now - self._stamps[0]))
+            self._stamps.append(now)
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    After ``threshold`` failures in a row the breaker opens for ``cooldown`` seconds,
+    then lets a single probe through (half-open). A failed probe reopens it with the
+    cooldown doubled, up to ``max_cooldown``; any success closes it and resets the cooldown.
+    """
+
+    def __init__(self, threshold: int = 3, cooldown: float = 30.0, max_cooldown: float = 300.0):
+        self._threshold = threshold
+        self._base_cooldown = cooldown
+        self._max_cooldown = max_cooldown
+        self._cooldown = cooldown
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._probing = False
+        self._probe_started = 0.0
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at < self._cooldown:
+            return "open"
+        return "half_open"
+
+    def allow(self) -> bool:
+        """Whether a request may go out now; in half-open state only the first caller probes."""
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "open":
+            return False
+        now = time.monotonic()
+        # A probe that never reported back (e.g. cancelled) is superseded after a cooldown
+        if self._probing and now - self._probe_started < self._cooldown:
+            return False
+        self._probing = True
+        self._probe_started = now
+        return True
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._opened_at = None
+        self._probing = False
+        self._cooldown = self._base_cooldown
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self._probing:
+            self._probing = False
+            self._cooldown = min(self._max_cooldown, self._cooldown * 2)
+            self._opened_at = time.monotonic()
+        elif self._opened_at is None and self._failures >= self._threshold:
+            self._opened_at = time.monotonic()
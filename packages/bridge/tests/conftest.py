@@ -4,28 +4,56 @@ Shared fixtures for bridge integration tests.
 
 import asyncio
 import os
-import random
+import socket
 import tempfile
+import uuid
 
+import httpx
 import pytest
+import pytest_asyncio
 import uvicorn
 
-from .mock_servers import create_gateway_app, create_mc_app
+from mc_bridge.bridge import CommsBridge
+from mc_bridge.config import BridgeConfig
+
+from .mock_servers import create_gateway_app, create_mc_app, reset_mc_db
+
+BRIDGE_READY_TIMEOUT = 10.0
+
+
+class _SignalingServer(uvicorn.Server):
+    """uvicorn.Server that sets ``ready`` as soon as startup completes."""
+
+    def __init__(self, config: uvicorn.Config):
+        super().__init__(config)
+        self.ready = asyncio.Event()
+
+    async def startup(self, sockets=None):
+        await super().startup(sockets)
+        if self.started:
+            self.ready.set()
 
 
 class _UvicornServer:
-    def __init__(self, app, host: str, port: int):
-        self.config = uvicorn.Config(app, host=host, port=port, log_level="error")
-        self.server = uvicorn.Server(self.config)
+    """Serves an app on a socket the OS already bound to a free port (no pick-then-bind race)."""
+
+    def __init__(self, app, host: str = "127.0.0.1"):
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.sock.bind((host, 0))
+        self.url = f"http://{host}:{self.sock.getsockname()[1]}"
+        self.config = uvicorn.Config(app, log_level="error")
+        self.server = _SignalingServer(self.config)
         self._task: asyncio.Task | None = None
 
     async def start(self):
-        self._task = asyncio.create_task(self.server.serve())
-        for _ in range(100):
-            if self.server.started:
-                return
-            await asyncio.sleep(0.05)
-        raise RuntimeError("Server did not start")
+        self._task = asyncio.create_task(self.server.serve(sockets=[self.sock]))
+        ready = asyncio.create_task(self.server.ready.wait())
+        # Wake on readiness, or on serve() exiting early if startup failed
+        await asyncio.wait({ready, self._task}, timeout=5, return_when=asyncio.FIRST_COMPLETED)
+        if not ready.done():
+            ready.cancel()
+            raise RuntimeError("Server did not start")
 
     async def stop(self):
         self.server.should_exit = True
@@ -34,48 +62,70 @@ class _UvicornServer:
                 await asyncio.wait_for(self._task, timeout=5)
             except (asyncio.TimeoutError, asyncio.CancelledError):
                 self._task.cancel()
+        self.sock.close()
 
 
 def _pick_port():
-    return random.randint(19000, 19999)
+    """A currently free port, for servers the bridge binds itself (e.g. metrics)."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
 
 
-@pytest.fixture
-async def mc_server():
-    port = _pick_port()
+# The mock servers start once per session (on the session event loop); tests that use
+# them run on that loop too, and each gets a freshly reset MC database.
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def _mc_session():
     db_fd, db_path = tempfile.mkstemp(suffix=".db")
     os.close(db_fd)
     app = create_mc_app(db_path)
-    srv = _UvicornServer(app, "127.0.0.1", port)
+    srv = _UvicornServer(app)
     await srv.start()
-    yield f"http://127.0.0.1:{port}"
+    yield srv.url, app
     await srv.stop()
-    try:
-        os.unlink(db_path)
-    except OSError:
-        pass
+    for path in (db_path, f"{db_path}-wal", f"{db_path}-shm"):
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
 
 
-@pytest.fixture
+@pytest_asyncio.fixture(loop_scope="session")
+async def mc_server(_mc_session):
+    url, app = _mc_session
+    await reset_mc_db(app.state.mc.db)
+    return url
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
 async def gw_server():
-    port = _pick_port()
     app = create_gateway_app()
-    srv = _UvicornServer(app, "127.0.0.1", port)
+    srv = _UvicornServer(app)
     await srv.start()
-    yield f"http://127.0.0.1:{port}"
+    yield srv.url
     await srv.stop()
 
 
-@pytest.fixture
-def bridge_config_dict(mc_server, gw_server, tmp_path):
+@pytest_asyncio.fixture(loop_scope="session")
+async def http_client():
+    """One keep-alive client per test for posting to and polling the mock MC."""
+    async with httpx.AsyncClient(
+        limits=httpx.Limits(max_keepalive_connections=32), timeout=5.0
+    ) as client:
+        yield client
+
+
+def _bridge_config_dict(mc_url: str, gw_url: str, db_path: str) -> dict:
     return {
         "mission_control": {
-            "url": mc_server,
+            "url": mc_url,
             "verify_tls": False,
             "request_timeout_seconds": 10,
         },
         "gateway": {
-            "url": gw_server,
+            "url": gw_url,
             "api_key_env": "TEST_GW_KEY",
         },
         "agents": [
@@ -87,8 +137,72 @@ def bridge_config_dict(mc_server, gw_server, tmp_path):
             }
         ],
         "state": {
-            "db_path": str(tmp_path / "bridge_state.db"),
+            "db_path": db_path,
         },
         "logging": {"level": "debug", "format": "text"},
         "metrics": {"enabled": False, "port": _pick_port()},
     }
+
+
+async def _start_bridge(config_dict: dict) -> CommsBridge:
+    """Start a bridge and wait until its SSE listeners are connected (subscribed on the MC)."""
+    bridge = CommsBridge(BridgeConfig.model_validate(config_dict))
+    await bridge.start()
+    try:
+        async with asyncio.timeout(BRIDGE_READY_TIMEOUT):
+            while not bridge.ready:
+                await asyncio.sleep(0.02)
+    except TimeoutError:
+        await bridge.stop()
+        raise RuntimeError("Bridge did not connect to the mock MC") from None
+    return bridge
+
+
+@pytest.fixture(scope="session")
+def bridge_config_dict(_mc_session, gw_server, tmp_path_factory):
+    """Config for the shared ``bridge``; tests isolate themselves with unique channel ids."""
+    db_path = tmp_path_factory.mktemp("bridge") / "bridge_state.db"
+    return _bridge_config_dict(_mc_session[0], gw_server, str(db_path))
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def bridge(bridge_config_dict):
+    """One running bridge for the whole session, connected to the shared mock MC."""
+    bridge = await _start_bridge(bridge_config_dict)
+    yield bridge
+    await bridge.stop()
+
+
+@pytest.fixture
+def channel_id():
+    return f"ch_{uuid.uuid4().hex[:12]}"
+
+
+@pytest_asyncio.fixture(loop_scope="session")
+async def isolated_bridge_config_dict(gw_server, tmp_path):
+    """
+    Config pointing at a private mock MC, for tests that stop and restart bridges.
+
+    The shared ``bridge`` never sees this MC's events, so it cannot answer in the
+    restarted bridge's place (or trade replies with it).
+    """
+    db_path = str(tmp_path / "mc.db")
+    srv = _UvicornServer(create_mc_app(db_path))
+    await srv.start()
+    yield _bridge_config_dict(srv.url, gw_server, str(tmp_path / "bridge_state.db"))
+    await srv.stop()
+
+
+@pytest_asyncio.fixture(loop_scope="session")
+async def start_bridge():
+    """Factory for test-owned bridges; any still running are stopped at teardown."""
+    bridges: list[CommsBridge] = []
+
+    async def start(config_dict: dict) -> CommsBridge:
+        bridge = await _start_bridge(config_dict)
+        bridges.append(bridge)
+        return bridge
+
+    yield start
+    for bridge in bridges:
+        await bridge.stop()
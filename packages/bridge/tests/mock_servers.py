@@ -6,28 +6,98 @@ Gateway: canned chat and command responses.
 """
 
 import asyncio
-import json
 import uuid
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Any, Optional
 
 import aiosqlite
+import orjson
 from fastapi import FastAPI, Header, Request
-from pydantic import BaseModel
+from fastapi.exceptions import RequestValidationError
+from pydantic import BaseModel, ConfigDict, ValidationError
 from sse_starlette.sse import EventSourceResponse
 
+# ── Request models ──
+# Module-level so each validator is built once; routes validate the raw body directly
+# instead of going through FastAPI's per-request body dependency.
+
+
+class _RequestModel(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
+
+class PostMsg(_RequestModel):
+    content: str
+    sender_id: str = "user_human"
+    sender_name: str = "Human User"
+
+
+class ChatReq(_RequestModel):
+    session_key: str
+    message: str
+    sender: str = "unknown"
+
+
+class CmdReq(_RequestModel):
+    session_key: str
+    command: str
+    args: str = ""
+
+
+async def _parse_body(model: type[BaseModel], request: Request) -> Any:
+    try:
+        return model.model_validate_json(await request.body())
+    except ValidationError as exc:
+        raise RequestValidationError(exc.errors()) from exc
+
+
 # ── Mock Mission Control ──
 
 MC_DB = ":memory:"
 
+# Hot-path SQL, kept as constants so sqlite3's per-connection statement cache always hits
+_SQL_INSERT_MSG = (
+    "INSERT INTO messages (id, channel_id, sender_id, sender_name, content, created_at)"
+    " VALUES (?, ?, ?, ?, ?, ?)"
+)
+_SQL_INSERT_EVT = "INSERT INTO events (org_slug, type, payload, created_at) VALUES (?, ?, ?, ?)"
+
+# Replay rows are read in chunks rather than loading the whole backlog at once
+REPLAY_FETCH_SIZE = 500
+_EVENT_DATA = '{"sequence_id": %d, "type": %s, "payload": %s, "created_at": %s}'
+
+
+def _json(obj) -> str:
+    return orjson.dumps(obj).decode()
+
+
+# Live fan-out: bounded per-client queues, drop-oldest when full; a client that keeps
+# falling behind is disconnected so it reconnects and replays from Last-Event-ID
+SUBSCRIBER_QUEUE_MAX = 1024
+SLOW_CLIENT_DROP_LIMIT = 100
+KEEPALIVE_SECONDS = 30.0
+
+
+class _Subscriber:
+    __slots__ = ("queue", "dropped")
+
+    def __init__(self):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_MAX)
+        self.dropped = 0
+
 
 class _MCState:
     def __init__(self):
         self.db: aiosqlite.Connection | None = None
-        self.subscribers: list[asyncio.Queue] = []
+        self.subscribers: set[_Subscriber] = set()
 
 
 async def init_mc_db(db: aiosqlite.Connection):
+    # Throwaway test databases: trade crash durability for fsync-free writes
+    await db.execute("PRAGMA journal_mode=WAL")
+    await db.execute("PRAGMA synchronous=OFF")
+    await db.execute("PRAGMA temp_store=MEMORY")
+    await db.execute("PRAGMA cache_size=-20000")
     await db.executescript("""
         CREATE TABLE IF NOT EXISTS channels (
             id TEXT PRIMARY KEY,
@@ -43,6 +113,8 @@ async def init_mc_db(db: aiosqlite.Connection):
             content TEXT NOT NULL,
             created_at TEXT NOT NULL
         );
+        CREATE INDEX IF NOT EXISTS idx_messages_channel_time
+            ON messages(channel_id, created_at DESC);
         CREATE TABLE IF NOT EXISTS events (
             sequence_id INTEGER PRIMARY KEY AUTOINCREMENT,
             org_slug TEXT NOT NULL DEFAULT 'test-org',
@@ -60,20 +132,27 @@ async def init_mc_db(db: aiosqlite.Connection):
     await db.commit()
 
 
+async def reset_mc_db(db: aiosqlite.Connection):
+    """Empty all tables and restart sequence ids, then re-seed (for server reuse across tests)."""
+    await db.executescript("""
+        DELETE FROM messages;
+        DELETE FROM events;
+        DELETE FROM channels;
+        DELETE FROM sqlite_sequence;
+    """)
+    await init_mc_db(db)
+
+
 def create_mc_app(db_path: str = ":memory:") -> FastAPI:
     """Create a mock MC FastAPI app using the given SQLite DB."""
     app = FastAPI(title="Mock MC")
 
-    class PostMsg(BaseModel):
-        content: str
-        sender_id: str = "user_human"
-        sender_name: str = "Human User"
-
     mc = _MCState()
+    app.state.mc = mc
 
     @app.on_event("startup")
     async def startup():
-        mc.db = await aiosqlite.connect(db_path)
+        mc.db = await aiosqlite.connect(db_path, cached_statements=256)
         mc.db.row_factory = aiosqlite.Row
         await init_mc_db(mc.db)
 
@@ -82,24 +161,31 @@ def create_mc_app(db_path: str = ":memory:") -> FastAPI:
         if mc.db:
             await mc.db.close()
 
-    async def emit_event(org_slug: str, event_type: str, payload: dict):
+    async def insert_event(org_slug: str, event_type: str, payload: dict, now: str) -> dict:
+        """Insert an event row in the caller's transaction; returns the SSE event to publish."""
         assert mc.db
-        now = datetime.now(timezone.utc).isoformat()
+        payload_text = _json(payload)
         cursor = await mc.db.execute(
-            "INSERT INTO events (org_slug, type, payload, created_at) VALUES (?, ?, ?, ?)",
-            (org_slug, event_type, json.dumps(payload), now),
+            _SQL_INSERT_EVT,
+            (org_slug, event_type, payload_text, now),
         )
         seq_id = cursor.lastrowid
-        await mc.db.commit()
+        # Serialized once and shared by every subscriber; same wire format as replay
         event_data = {
-            "sequence_id": seq_id,
-            "type": event_type,
-            "payload": payload,
-            "created_at": now,
+            "event": event_type,
+            "id": str(seq_id),
+            "data": _EVENT_DATA % (seq_id, _json(event_type), payload_text, _json(now)),
         }
-        for q in mc.subscribers:
-            await q.put(event_data)
-        return seq_id
+        return event_data
+
+    def publish_event(event_data: dict) -> None:
+        for sub in mc.subscribers:
+            try:
+                sub.queue.put_nowait(event_data)
+            except asyncio.QueueFull:
+                sub.queue.get_nowait()
+                sub.queue.put_nowait(event_data)
+                sub.dropped += 1
 
     @app.get("/health")
     async def health():
@@ -112,15 +198,15 @@ def create_mc_app(db_path: str = ":memory:") -> FastAPI:
         return [dict(r) for r in rows]
 
     @app.post("/api/v1/channels/{channel_id}/messages")
-    async def post_message(channel_id: str, body: PostMsg):
+    async def post_message(channel_id: str, request: Request):
+        body = await _parse_body(PostMsg, request)
         assert mc.db
         msg_id = str(uuid.uuid4())
         now = datetime.now(timezone.utc).isoformat()
         await mc.db.execute(
-            "INSERT INTO messages (id, channel_id, sender_id, sender_name, content, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+            _SQL_INSERT_MSG,
             (msg_id, channel_id, body.sender_id, body.sender_name, body.content, now),
         )
-        await mc.db.commit()
 
         payload = {
             "message_id": msg_id,
@@ -137,9 +223,13 @@ def create_mc_app(db_path: str = ":memory:") -> FastAPI:
                 "command": parts[0],
                 "args": parts[1] if len(parts) > 1 else "",
             }
-            await emit_event("test-org", "command.invoked", cmd_payload)
+            event_data = await insert_event("test-org", "command.invoked", cmd_payload, now)
         else:
-            await emit_event("test-org", "message.created", payload)
+            event_data = await insert_event("test-org", "message.created", payload, now)
+
+        # Message and event rows commit together; subscribers only see committed events
+        await mc.db.commit()
+        publish_event(event_data)
 
         return {"id": msg_id, "status": "created"}
 
@@ -158,44 +248,50 @@ def create_mc_app(db_path: str = ":memory:") -> FastAPI:
         org_slug: str,
         last_event_id: Optional[int] = Header(None, alias="Last-Event-ID"),
     ):
-        queue: asyncio.Queue = asyncio.Queue()
-        mc.subscribers.append(queue)
+        sub = _Subscriber()
+        mc.subscribers.add(sub)
 
         async def generate():
+            get_task: asyncio.Task | None = None
             try:
                 if last_event_id is not None and mc.db:
-                    rows = await mc.db.execute_fetchall(
-                        "SELECT * FROM events WHERE sequence_id > ? ORDER BY sequence_id ASC",
+                    async with mc.db.execute(
+                        "SELECT sequence_id, type, payload, created_at FROM events"
+                        " WHERE sequence_id > ? ORDER BY sequence_id ASC",
                         (last_event_id,),
-                    )
-                    for row in rows:
-                        evt = dict(row)
-                        yield {
-                            "event": evt["type"],
-                            "id": str(evt["sequence_id"]),
-                            "data": json.dumps(
-                                {
-                                    "sequence_id": evt["sequence_id"],
-                                    "type": evt["type"],
-                                    "payload": json.loads(evt["payload"]),
-                                    "created_at": evt["created_at"],
+                    ) as cur:
+                        while rows := await cur.fetchmany(REPLAY_FETCH_SIZE):
+                            for seq, event_type, payload, created_at in rows:
+                                # payload is stored as JSON text; splice it in as-is
+                                yield {
+                                    "event": event_type,
+                                    "id": str(seq),
+                                    "data": _EVENT_DATA
+                                    % (
+                                        seq,
+                                        _json(event_type),
+                                        payload,
+                                        _json(created_at),
+                                    ),
                                 }
-                            ),
-                        }
                 while True:
-                    if await request.is_disconnected():
+                    if await request.is_disconnected() or sub.dropped >= SLOW_CLIENT_DROP_LIMIT:
                         break
-                    try:
-                        event_data = await asyncio.wait_for(queue.get(), timeout=30.0)
-                        yield {
-                            "event": event_data["type"],
-                            "id": str(event_data["sequence_id"]),
-                            "data": json.dumps(event_data),
-                        }
-                    except asyncio.TimeoutError:
+                    # Keep the pending get across keepalives; asyncio.wait's timeout
+                    # returns normally instead of raising like wait_for
+                    if get_task is None:
+                        get_task = asyncio.create_task(sub.queue.get())
+                    done, _ = await asyncio.wait({get_task}, timeout=KEEPALIVE_SECONDS)
+                    if not done:
                         yield {"comment": "keepalive"}
+                        continue
+                    event_data = get_task.result()
+                    get_task = None
+                    yield event_data
             finally:
-                mc.subscribers.remove(queue)
+                if get_task is not None:
+                    get_task.cancel()
+                mc.subscribers.discard(sub)
 
         return EventSourceResponse(generate())
 
@@ -208,26 +304,18 @@ def create_mc_app(db_path: str = ":memory:") -> FastAPI:
 def create_gateway_app() -> FastAPI:
     app = FastAPI(title="Mock Gateway")
 
-    class ChatReq(BaseModel):
-        session_key: str
-        message: str
-        sender: str = "unknown"
-
-    class CmdReq(BaseModel):
-        session_key: str
-        command: str
-        args: str = ""
-
     @app.get("/health")
     async def health():
         return {"status": "ok"}
 
     @app.post("/v1/chat")
-    async def chat(req: ChatReq):
+    async def chat(request: Request):
+        req = await _parse_body(ChatReq, request)
         return {"session_key": req.session_key, "response": f"Agent response to: {req.message}"}
 
     @app.post("/v1/command")
-    async def command(req: CmdReq):
+    async def command(request: Request):
+        req = await _parse_body(CmdReq, request)
         if req.command == "/status":
             output = (
                 f"🟢 Status for session {req.session_key}:\n  Active tasks: 3\n  Pending reviews: 1"
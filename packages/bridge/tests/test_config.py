@@ -1,7 +1,10 @@
 """Tests for configuration loading."""
 
+import json
+
 import pytest
 import yaml
+from pydantic import ValidationError
 
 from mc_bridge.config import BridgeConfig, load_config
 
@@ -21,6 +24,19 @@ def test_load_config_from_yaml(tmp_path):
     assert cfg.agents[0].org_slug == "acme"
 
 
+def test_load_config_from_json(tmp_path):
+    config_data = {
+        "mission_control": {"url": "https://mc.example.com"},
+        "agents": [{"name": "agent-1", "api_key_env": "KEY_1", "org_slug": "acme"}],
+    }
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps(config_data))
+
+    cfg = load_config(path)
+    assert cfg.mission_control.url == "https://mc.example.com"
+    assert cfg.agents[0].org_slug == "acme"
+
+
 def test_load_config_defaults():
     cfg = BridgeConfig()
     assert cfg.mission_control.url == "http://localhost:8000"
@@ -31,3 +47,11 @@ def test_load_config_defaults():
 def test_load_config_file_not_found():
     with pytest.raises(FileNotFoundError):
         load_config("/nonexistent/path.yaml")
+
+
+def test_load_config_rejects_unknown_keys(tmp_path):
+    path = tmp_path / "config.yaml"
+    path.write_text(yaml.dump({"mission_control": {"url": "https://mc.example.com", "uri": "x"}}))
+
+    with pytest.raises(ValidationError):
+        load_config(path)
@@ -0,0 +1,69 @@
+"""Tests for the cached DNS resolver."""
+
+import asyncio
+import socket
+
+import httpx
+import pytest
+
+from mc_bridge import dns
+from mc_bridge.dns import CachingResolver, proxy_mounts
+
+
+@pytest.fixture
+async def lookups(monkeypatch) -> list[str]:
+    calls: list[str] = []
+    loop = asyncio.get_running_loop()
+
+    async def fake_getaddrinfo(host, port, **kwargs):
+        calls.append(host)
+        return [(socket.AF_INET, socket.SOCK_STREAM, 6, "", ("10.0.0.7", port))]
+
+    monkeypatch.setattr(loop, "getaddrinfo", fake_getaddrinfo)
+    return calls
+
+
+async def test_resolutions_are_cached(lookups):
+    resolver = CachingResolver()
+    assert await resolver.resolve("mc.example.com", 443) == ["10.0.0.7"]
+    assert await resolver.resolve("mc.example.com", 443) == ["10.0.0.7"]
+    assert lookups == ["mc.example.com"]
+
+    resolver.invalidate("mc.example.com", 443)
+    await resolver.resolve("mc.example.com", 443)
+    assert lookups == ["mc.example.com", "mc.example.com"]
+
+
+async def test_ip_literals_skip_lookup(lookups):
+    resolver = CachingResolver()
+    assert await resolver.resolve("127.0.0.1", 8000) == ["127.0.0.1"]
+    assert lookups == []
+
+
+def test_proxy_mounts_follow_environment(monkeypatch):
+    monkeypatch.setenv("HTTPS_PROXY", "http://proxy.internal:3128")
+    monkeypatch.setenv("NO_PROXY", "mc.example.com")
+    mounts = proxy_mounts()
+    assert isinstance(mounts["https://"], httpx.AsyncHTTPTransport)
+    assert mounts["all://*mc.example.com"] is None
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_cached_transport_connects_through_resolver(gw_server, monkeypatch):
+    # Guards the httpx/httpcore internals cached_transport() hooks into
+    resolver = CachingResolver()
+    resolved: list[str] = []
+    original = resolver.resolve
+
+    async def spy(host: str, port: int) -> list[str]:
+        resolved.append(host)
+        return await original(host, port)
+
+    monkeypatch.setattr(resolver, "resolve", spy)
+    monkeypatch.setattr(dns, "_resolver", resolver)
+
+    url = gw_server.replace("127.0.0.1", "localhost")
+    async with httpx.AsyncClient(transport=dns.cached_transport()) as client:
+        resp = await client.get(f"{url}/health")
+    assert resp.status_code == 200
+    assert resolved == ["localhost"]
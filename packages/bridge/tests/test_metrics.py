@@ -24,3 +24,14 @@ def test_prometheus_format():
     assert "bridge_messages_inbound_total 5" in text
     assert "bridge_sse_connections_active 2" in text
     assert "bridge_uptime_seconds" in text
+
+
+def test_prometheus_reflects_updates_after_render():
+    m = MetricsCollector()
+    m.inc("messages_inbound_total")
+    assert "bridge_messages_inbound_total 1" in m.to_prometheus()
+    m.inc("messages_inbound_total")
+    m.inc("commands_routed_total")
+    text = m.to_prometheus()
+    assert "bridge_messages_inbound_total 2" in text
+    assert text.index("bridge_commands_routed_total") < text.index("bridge_messages_inbound_total")
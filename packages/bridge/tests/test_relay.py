@@ -0,0 +1,44 @@
+"""Tests for outbound buffering in the message relay."""
+
+from mc_bridge.metrics import MetricsCollector
+from mc_bridge.relay import (
+    PRIORITY_COMMAND,
+    PRIORITY_DIAGNOSTIC,
+    PRIORITY_RESPONSE,
+    MessageRelay,
+    _BoundedBuffer,
+)
+
+
+def _item(content: str, priority: int) -> dict:
+    return {"channel_id": "ch1", "content": content, "priority": priority}
+
+
+def test_buffer_serves_highest_priority_first():
+    buf = _BoundedBuffer(10)
+    buf.append(_item("a", PRIORITY_RESPONSE))
+    buf.append(_item("b", PRIORITY_COMMAND))
+    buf.append(_item("c", PRIORITY_RESPONSE))
+    assert [buf.popleft()["content"] for _ in range(len(buf))] == ["b", "a", "c"]
+
+
+def test_buffer_overflow_drops_oldest_lowest_priority():
+    buf = _BoundedBuffer(2)
+    buf.append(_item("diag", PRIORITY_DIAGNOSTIC))
+    buf.append(_item("resp", PRIORITY_RESPONSE))
+    assert buf.append(_item("cmd", PRIORITY_COMMAND))["content"] == "diag"
+
+    # Nothing buffered ranks below a new diagnostic, so the new item is the one dropped
+    dropped = _item("diag2", PRIORITY_DIAGNOSTIC)
+    assert buf.append(dropped) is dropped
+    assert len(buf) == 2
+
+
+def test_relay_counts_dropped_posts():
+    metrics = MetricsCollector()
+    relay = MessageRelay("http://mc", "http://gw", metrics=metrics)
+    relay._outbound_buffer = _BoundedBuffer(1)
+    relay._buffer(_item("a", PRIORITY_RESPONSE))
+    relay._buffer(_item("b", PRIORITY_RESPONSE))
+    assert relay.outbound_pending == 1
+    assert "bridge_messages_outbound_dropped_total 1" in metrics.to_prometheus()
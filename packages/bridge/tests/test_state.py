@@ -1,5 +1,8 @@
 """Tests for SQLite state persistence."""
 
+import asyncio
+
+import aiosqlite
 import pytest
 
 from mc_bridge.state import BridgeState
@@ -42,3 +45,90 @@ async def test_event_cursor(state: BridgeState):
 
     await state.save_cursor("agent-1", "acme", "99")
     assert await state.get_cursor("agent-1") == "99"
+
+
+async def test_event_cursor_persists_across_reopen(tmp_path):
+    db_path = str(tmp_path / "cursor.db")
+    s = BridgeState(db_path)
+    await s.open()
+    await s.save_cursor("agent-1", "acme", "7")
+    await s.save_cursor("agent-1", "acme", "8")
+    await s.close()
+
+    s = BridgeState(db_path)
+    await s.open()
+    try:
+        assert await s.get_cursor("agent-1") == "8"
+    finally:
+        await s.close()
+
+
+async def test_session_key_cache_follows_remap(state: BridgeState):
+    await state.create_session_mapping("mc:acme:project:p1", "agent-1", "acme", "ch1")
+    assert await state.get_session_key("ch1", "agent-1") == "mc:acme:project:p1"
+
+    # Same session key moved to another channel: the old lookup must not be served
+    await state.create_session_mapping("mc:acme:project:p1", "agent-1", "acme", "ch2")
+    assert await state.get_session_key("ch1", "agent-1") is None
+    assert await state.get_session_key("ch2", "agent-1") == "mc:acme:project:p1"
+
+
+async def test_get_or_create_session_key(state: BridgeState):
+    key, created = await state.get_or_create_session_key("ch1", "agent-1", "acme")
+    assert (key, created) == ("mc:acme:project:ch1", True)
+    assert await state.get_or_create_session_key("ch1", "agent-1", "acme") == (key, False)
+    assert len(await state.list_sessions("agent-1")) == 1
+    assert await state.get_channel_id(key) == "ch1"
+
+
+async def test_get_or_create_keeps_existing_mapping_after_reopen(tmp_path):
+    db_path = str(tmp_path / "resolve.db")
+    s = BridgeState(db_path)
+    await s.open()
+    await s.create_session_mapping("mc:acme:project:PROJ1", "agent-1", "acme", "CH1")
+    await s.close()
+
+    # Fresh process: nothing cached, the stored mapping must still be used
+    s = BridgeState(db_path)
+    await s.open()
+    try:
+        assert await s.get_or_create_session_key("CH1", "agent-1", "acme") == (
+            "mc:acme:project:PROJ1",
+            False,
+        )
+        assert len(await s.list_sessions("agent-1")) == 1
+    finally:
+        await s.close()
+
+
+async def test_batch_commits_once_on_exit(state: BridgeState, tmp_path):
+    async def committed_sessions() -> int:
+        async with aiosqlite.connect(str(tmp_path / "test.db")) as db:
+            cursor = await db.execute("SELECT COUNT(*) FROM session_mappings")
+            return (await cursor.fetchone())[0]
+
+    async with state.batch():
+        await state.create_session_mapping("mc:acme:project:ch1", "agent-1", "acme", "ch1")
+        await state.create_session_mapping("mc:acme:project:ch2", "agent-1", "acme", "ch2")
+        assert await committed_sessions() == 0
+    assert await committed_sessions() == 2
+
+
+async def test_batch_does_not_defer_other_tasks(state: BridgeState, tmp_path):
+    async def committed_sessions() -> int:
+        async with aiosqlite.connect(str(tmp_path / "test.db")) as db:
+            cursor = await db.execute("SELECT COUNT(*) FROM session_mappings")
+            return (await cursor.fetchone())[0]
+
+    release = asyncio.Event()
+
+    async def long_batch() -> None:
+        async with state.batch():
+            await release.wait()
+
+    holder = asyncio.create_task(long_batch())
+    await asyncio.sleep(0)
+    await state.create_session_mapping("mc:acme:project:ch1", "agent-2", "acme", "ch1")
+    assert await committed_sessions() == 1
+    release.set()
+    await holder
@@ -0,0 +1,69 @@
+"""Tests for outbound flow control."""
+
+import asyncio
+
+import pytest
+
+from mc_bridge.throttle import AIMDLimiter, CircuitBreaker, RateWindow
+
+
+async def test_aimd_increases_on_fast_success():
+    limiter = AIMDLimiter(initial=2, increase=1, target_latency=10.0)
+    async with limiter.slot():
+        assert limiter.in_flight == 1
+    assert limiter.limit == 3
+    assert limiter.in_flight == 0
+
+
+async def test_aimd_decreases_on_congestion():
+    limiter = AIMDLimiter(initial=8, decrease=0.5)
+    async with limiter.slot() as permit:
+        permit.congested = True
+    assert limiter.limit == 4
+
+    with pytest.raises(ConnectionError):
+        async with limiter.slot():
+            raise ConnectionError
+    assert limiter.limit == 2
+
+
+async def test_aimd_respects_minimum():
+    limiter = AIMDLimiter(initial=1, minimum=1)
+    async with limiter.slot() as permit:
+        permit.congested = True
+    assert limiter.limit == 1
+
+
+async def test_rate_window_paces_excess_requests():
+    window = RateWindow(limit=2, period=0.2)
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    for _ in range(3):
+        await window.acquire()
+    assert loop.time() - start >= 0.19
+
+
+def test_circuit_breaker_opens_and_probes(monkeypatch):
+    now = 1000.0
+    monkeypatch.setattr("mc_bridge.throttle.time.monotonic", lambda: now)
+    breaker = CircuitBreaker(threshold=2, cooldown=10.0)
+
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+    now += 10.0
+    assert breaker.state == "half_open"
+    assert breaker.allow()  # The probe
+    assert not breaker.allow()
+
+    # Failed probe reopens with a doubled cooldown
+    breaker.record_failure()
+    now += 10.0
+    assert breaker.state == "open"
+    now += 10.0
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed"
@@ -6,7 +6,6 @@ Create Date: 2026-02-15 14:00:00.000000
 """
 
 from typing import Sequence, Union
-from datetime import datetime, timezone
 
 from alembic import op
 import sqlalchemy as sa
@@ -38,23 +37,142 @@ RLS_TABLES = [
     "subscriptions",
 ]
 
+# Tenant predicate for the RLS policies. Wrapping current_setting() in a scalar
+# subquery lets Postgres evaluate it once per statement (an InitPlan) instead of
+# once per row, so the org_id comparison can use the org_id indexes.
+RLS_ORG_PREDICATE = "org_id = (SELECT current_setting('app.current_org_id')::uuid)"
+
+
+# messages is HASH-partitioned on channel_id: channel history, the dominant read,
+# touches a single partition and pages through it by created_at.
+MESSAGES_HASH_PARTITIONS = 32
+
+# events is HASH-partitioned on org_id so single-tenant queries (every query,
+# under RLS) touch one bucket; each bucket is then RANGE-partitioned by month.
+EVENTS_HASH_PARTITIONS = 16
+EVENTS_HASH_BUCKETS = [f"events_h{i}" for i in range(EVENTS_HASH_PARTITIONS)]
+
+# Monthly (RANGE) partitioned tables and their partition key columns.
+PARTITIONED_TABLES = {bucket: "timestamp" for bucket in EVENTS_HASH_BUCKETS}
+
+# Monthly partitions kept provisioned ahead of the current month.
+PARTITION_PREMAKE = 4
+
+# Heap pages summarised per BRIN range (default 128). Rows are appended in time
+# order, so narrower ranges give tighter min/max bounds for time scans.
+BRIN_PAGES_PER_RANGE = 32
+
+# GIN pending list size for the messages FTS index, in kB (server default 4MB).
+MESSAGES_GIN_PENDING_LIST_KB = 65536
+
+
+def _partman_available() -> bool:
+    return bool(
+        op.get_bind()
+        .execute(sa.text("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_partman'"))
+        .scalar()
+    )
 
-def _create_partitions(table: str, ts_col: str) -> None:
-    """Create partitions for the current month, next month, and a default."""
-    now = datetime.now(timezone.utc)
-    for offset in range(2):
-        year = now.year + (now.month + offset - 1) // 12
-        month = (now.month + offset - 1) % 12 + 1
-        next_year = year + (month) // 12
-        next_month = (month) % 12 + 1
-        part_name = f"{table}_y{year}m{month:02d}"
-        start = f"{year}-{month:02d}-01"
-        end = f"{next_year}-{next_month:02d}-01"
-        op.execute(
-            f"CREATE TABLE {part_name} PARTITION OF {table} "
-            f"FOR VALUES FROM ('{start}') TO ('{end}')"
-        )
-    op.execute(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT")
+
+def _create_partman_parent(table: str, ts_col: str) -> None:
+    """Register a table with pg_partman; it premakes monthly partitions plus a default."""
+    op.execute(
+        sa.text(
+            "SELECT partman.create_parent(p_parent_table := :parent, p_control := :control, "
+            "p_interval := '1 month', p_premake := :premake)"
+        ).bindparams(parent=f"public.{table}", control=ts_col, premake=PARTITION_PREMAKE)
+    )
+
+
+def _create_partitions(tables: list[str]) -> None:
+    """Create partitions for the current month, PARTITION_PREMAKE months ahead, and a default.
+
+    Fallback for servers without pg_partman (e.g. the postgres:16-alpine dev image);
+    nothing provisions later months, so new rows eventually land in the default.
+    Runs as one DO block, so the partitions of every table cost a single round trip.
+    """
+    table_list = ", ".join(f"'{table}'" for table in tables)
+    op.execute(f"""
+        DO $$
+        DECLARE
+            parent text;
+            start_month date;
+        BEGIN
+            FOREACH parent IN ARRAY ARRAY[{table_list}] LOOP
+                FOR start_month IN
+                    SELECT generate_series(
+                        date_trunc('month', now() AT TIME ZONE 'UTC'),
+                        date_trunc('month', now() AT TIME ZONE 'UTC')
+                            + interval '{PARTITION_PREMAKE} months',
+                        interval '1 month'
+                    )::date
+                LOOP
+                    EXECUTE format(
+                        'CREATE TABLE %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+                        parent || to_char(start_month, '"_y"YYYY"m"MM'),
+                        parent,
+                        start_month,
+                        (start_month + interval '1 month')::date
+                    );
+                END LOOP;
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF %I DEFAULT', parent || '_default', parent
+                );
+            END LOOP;
+        END
+        $$
+    """)
+
+
+def _set_partition_options(table: str, options: str) -> None:
+    """Set storage options on each leaf partition of ``table``.
+
+    Partitioned parents take no storage options; pg_partman copies them from its
+    template table to partitions it creates later, so that is updated too.
+    """
+    op.execute(f"""
+        DO $$
+        DECLARE
+            part regclass;
+        BEGIN
+            FOR part IN SELECT relid FROM pg_partition_tree('{table}') WHERE isleaf LOOP
+                EXECUTE format('ALTER TABLE %s SET ({options})', part);
+            END LOOP;
+            IF to_regclass('partman.part_config') IS NOT NULL THEN
+                FOR part IN
+                    SELECT template_table::regclass FROM partman.part_config
+                    WHERE parent_table = 'public.{table}' AND template_table IS NOT NULL
+                LOOP
+                    EXECUTE format('ALTER TABLE %s SET ({options})', part);
+                END LOOP;
+            END IF;
+        END
+        $$
+    """)
+
+
+# Tables whose search_vector is maintained by a trigger: table -> weight-A column
+# (description is weight B).
+FTS_TRIGGER_TABLES = {"projects": "name", "tasks": "title"}
+
+
+def _create_fts_trigger(table: str, title_col: str) -> None:
+    """Keep ``table.search_vector`` current with a trigger on its text columns."""
+    op.execute(f"""
+        CREATE FUNCTION {table}_search_vector_update() RETURNS trigger AS $$
+        BEGIN
+            NEW.search_vector :=
+                setweight(to_tsvector('english', coalesce(NEW.{title_col}, '')), 'A') ||
+                setweight(to_tsvector('english', coalesce(NEW.description, '')), 'B');
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute(f"""
+        CREATE TRIGGER {table}_search_vector
+        BEFORE INSERT OR UPDATE OF {title_col}, description ON {table}
+        FOR EACH ROW EXECUTE FUNCTION {table}_search_vector_update()
+    """)
 
 
 # ---------------------------------------------------------------------------
@@ -63,6 +181,11 @@ def _create_partitions(table: str, ts_col: str) -> None:
 
 
 def upgrade() -> None:
+    # The whole upgrade is one transaction: its single commit need not wait for
+    # the WAL flush, and role-level statement timeouts must not abort it midway
+    op.execute("SET LOCAL synchronous_commit = off")
+    op.execute("SET LOCAL statement_timeout = 0")
+
     # -----------------------------------------------------------------------
     # 1. Core tables (non-partitioned)
     # -----------------------------------------------------------------------
@@ -95,7 +218,7 @@ def upgrade() -> None:
     op.create_table(
         "users",
         sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
-        sa.Column("email", sa.Text(), nullable=True, unique=True),
+        sa.Column("email", sa.Text(), nullable=True),
         sa.Column("type", sa.Text(), nullable=False),
         sa.Column("identifier", sa.Text(), nullable=True),
         sa.Column("oidc_provider", sa.Text(), nullable=True),
@@ -108,7 +231,15 @@ def upgrade() -> None:
             server_default=sa.text("now()"),
         ),
     )
-    op.create_index("idx_users_email", "users", ["email"], unique=True)
+    # The one unique index on email. Login reads only id and password_hash, so
+    # carrying them here makes the lookup an index-only scan
+    op.create_index(
+        "idx_users_email",
+        "users",
+        ["email"],
+        unique=True,
+        postgresql_include=["id", "password_hash"],
+    )
 
     # users_orgs
     op.create_table(
@@ -159,10 +290,17 @@ def upgrade() -> None:
             nullable=False,
             server_default=sa.text("now()"),
         ),
-        # FTS generated column added via raw SQL below
+        # Maintained by the FTS trigger created below
+        sa.Column("search_vector", postgresql.TSVECTOR(), nullable=True),
     )
     op.create_index("idx_projects_org", "projects", ["org_id"])
-    op.create_index("idx_projects_stage", "projects", ["org_id", "stage"])
+    # Covering: id/name/updated_at ride along so stage listings can skip the heap
+    op.create_index(
+        "idx_projects_stage",
+        "projects",
+        ["org_id", "stage"],
+        postgresql_include=["id", "updated_at", "name"],
+    )
 
     # tasks
     op.create_table(
@@ -194,11 +332,22 @@ def upgrade() -> None:
         ),
         sa.Column("completed_at", sa.DateTime(timezone=True), nullable=True),
         sa.Column("archived_at", sa.DateTime(timezone=True), nullable=True),
-        # FTS generated column added via raw SQL below
+        # Maintained by the FTS trigger created below
+        sa.Column("search_vector", postgresql.TSVECTOR(), nullable=True),
     )
     op.create_index("idx_tasks_org", "tasks", ["org_id"])
-    op.create_index("idx_tasks_status", "tasks", ["org_id", "status"])
+    # Covering: status-filtered listings and per-status counts (joined on id)
+    # can be served by index-only scans
+    op.create_index(
+        "idx_tasks_status",
+        "tasks",
+        ["org_id", "status"],
+        postgresql_include=["id", "updated_at", "title"],
+    )
     op.create_index("idx_tasks_priority", "tasks", ["org_id", "priority"])
+    # Tasks are updated often: leave page room for HOT updates and vacuum
+    # sooner so the visibility map stays current for index-only scans
+    op.execute("ALTER TABLE tasks SET (fillfactor = 90, autovacuum_vacuum_scale_factor = 0.05)")
 
     # task_project_assignments
     op.create_table(
@@ -219,7 +368,9 @@ def upgrade() -> None:
             nullable=False,
         ),
     )
-    op.create_index("idx_task_projects_project", "task_project_assignments", ["project_id"])
+    op.create_index(
+        "idx_task_projects_project", "task_project_assignments", ["org_id", "project_id"]
+    )
 
     # project_user_assignments
     op.create_table(
@@ -246,7 +397,7 @@ def upgrade() -> None:
             server_default=sa.text("now()"),
         ),
     )
-    op.create_index("idx_project_users_user", "project_user_assignments", ["user_id"])
+    op.create_index("idx_project_users_user", "project_user_assignments", ["org_id", "user_id"])
 
     # task_user_assignments
     op.create_table(
@@ -264,7 +415,7 @@ def upgrade() -> None:
             nullable=False,
         ),
     )
-    op.create_index("idx_task_users_user", "task_user_assignments", ["user_id"])
+    op.create_index("idx_task_users_user", "task_user_assignments", ["org_id", "user_id"])
 
     # task_dependencies
     op.create_table(
@@ -336,7 +487,12 @@ def upgrade() -> None:
         ),
     )
     op.create_index("idx_channels_org", "channels", ["org_id"])
-    op.create_index("idx_channels_project", "channels", ["org_id", "project_id"])
+    op.create_index(
+        "idx_channels_project",
+        "channels",
+        ["org_id", "project_id"],
+        postgresql_include=["id", "name", "type"],
+    )
 
     # sub_agents
     op.create_table(
@@ -373,6 +529,7 @@ def upgrade() -> None:
         "idx_sub_agents_status",
         "sub_agents",
         ["org_id", "status"],
+        postgresql_include=["id", "expires_at"],
         postgresql_where=sa.text("status = 'active'"),
     )
 
@@ -396,13 +553,23 @@ def upgrade() -> None:
     # 2. Partitioned tables
     # -----------------------------------------------------------------------
 
-    # messages (partitioned by RANGE on created_at)
+    # messages (partitioned by HASH on channel_id)
     op.create_table(
         "messages",
         sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
         sa.Column("org_id", postgresql.UUID(as_uuid=True), nullable=False),
         sa.Column("channel_id", postgresql.UUID(as_uuid=True), nullable=False),
         sa.Column("sender_id", postgresql.UUID(as_uuid=True), nullable=False),
+        # Fixed-width columns first, variable-length last: no alignment padding
+        # between them. mentions has no index: nothing queries by mention (they
+        # fan out as events when the message is posted); add a GIN index on it
+        # if a "messages mentioning me" query is introduced.
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.text("now()"),
+        ),
         sa.Column("content", sa.Text(), nullable=False),
         sa.Column(
             "mentions",
@@ -410,22 +577,43 @@ def upgrade() -> None:
             server_default="{}",
             nullable=True,
         ),
-        sa.Column(
-            "created_at",
-            sa.DateTime(timezone=True),
-            nullable=False,
-            server_default=sa.text("now()"),
-        ),
-        sa.PrimaryKeyConstraint("id", "created_at"),
-        postgresql_partition_by="RANGE (created_at)",
+        sa.PrimaryKeyConstraint("id", "channel_id"),
+        postgresql_partition_by="HASH (channel_id)",
+    )
+    for remainder in range(MESSAGES_HASH_PARTITIONS):
+        op.execute(
+            f"CREATE TABLE messages_h{remainder} PARTITION OF messages "
+            f"FOR VALUES WITH (MODULUS {MESSAGES_HASH_PARTITIONS}, REMAINDER {remainder})"
+        )
+    # Lead with org_id so index scans also satisfy the RLS org predicate
+    op.create_index(
+        "idx_messages_channel",
+        "messages",
+        ["org_id", "channel_id", sa.text("created_at DESC")],
+    )
+    op.create_index(
+        "idx_messages_sender",
+        "messages",
+        ["org_id", "sender_id", sa.text("created_at DESC")],
     )
-    op.create_index("idx_messages_channel", "messages", ["channel_id", sa.text("created_at DESC")])
 
-    # events (partitioned by RANGE on timestamp)
+    # events.sequence_id is the SSE replay cursor (clients resume with
+    # sequence_id > Last-Event-ID), so it must be handed out in order across
+    # backends: CACHE 1. A larger per-backend cache (or an identity column,
+    # which partitioned tables only support from Postgres 17) would let one
+    # connection's ids land behind another's and be skipped on resume.
+    op.execute("CREATE SEQUENCE IF NOT EXISTS events_sequence_id_seq CACHE 1")
+
+    # events (partitioned by HASH on org_id, then RANGE on timestamp)
     op.create_table(
         "events",
         sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
-        sa.Column("sequence_id", sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column(
+            "sequence_id",
+            sa.BigInteger(),
+            nullable=False,
+            server_default=sa.text("nextval('events_sequence_id_seq')"),
+        ),
         sa.Column("org_id", postgresql.UUID(as_uuid=True), nullable=False),
         sa.Column("type", sa.Text(), nullable=False),
         sa.Column("actor_id", postgresql.UUID(as_uuid=True), nullable=True),
@@ -434,59 +622,73 @@ def upgrade() -> None:
         sa.Column(
             "timestamp", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("now()")
         ),
-        sa.PrimaryKeyConstraint("id", "timestamp"),
-        postgresql_partition_by="RANGE (timestamp)",
+        sa.PrimaryKeyConstraint("id", "timestamp", "org_id"),
+        postgresql_partition_by="HASH (org_id)",
     )
+    for remainder, bucket in enumerate(EVENTS_HASH_BUCKETS):
+        op.execute(
+            f"CREATE TABLE {bucket} PARTITION OF events "
+            f"FOR VALUES WITH (MODULUS {EVENTS_HASH_PARTITIONS}, REMAINDER {remainder}) "
+            "PARTITION BY RANGE (timestamp)"
+        )
 
-    # Create sequence for events.sequence_id
-    op.execute("CREATE SEQUENCE IF NOT EXISTS events_sequence_id_seq")
+    # Drop the sequence together with the table
+    op.execute("ALTER SEQUENCE events_sequence_id_seq OWNED BY events.sequence_id")
+
+    # BRIN indexes for partitioned tables. Postgres builds these locally on each
+    # partition (including ones pg_partman creates later), so the range size
+    # applies per partition
     op.execute(
-        "ALTER TABLE events ALTER COLUMN sequence_id SET DEFAULT nextval('events_sequence_id_seq')"
+        "CREATE INDEX idx_messages_time ON messages USING BRIN (created_at) "
+        f"WITH (pages_per_range = {BRIN_PAGES_PER_RANGE})"
+    )
+    op.execute(
+        "CREATE INDEX idx_events_time ON events USING BRIN (timestamp) "
+        f"WITH (pages_per_range = {BRIN_PAGES_PER_RANGE})"
     )
 
-    # BRIN indexes for partitioned tables
-    op.execute("CREATE INDEX idx_messages_time ON messages USING BRIN (created_at)")
-    op.execute("CREATE INDEX idx_events_time ON events USING BRIN (timestamp)")
-
-    # Create partitions
-    _create_partitions("messages", "created_at")
-    _create_partitions("events", "timestamp")
+    # Create partitions: pg_partman where available (maintained by the
+    # run_partition_maintenance worker job), otherwise a fixed set
+    if _partman_available():
+        op.execute("CREATE SCHEMA IF NOT EXISTS partman")
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_partman SCHEMA partman")
+        for table, ts_col in PARTITIONED_TABLES.items():
+            _create_partman_parent(table, ts_col)
+    else:
+        _create_partitions(list(PARTITIONED_TABLES))
 
     # -----------------------------------------------------------------------
-    # 3. Full-Text Search (generated tsvector columns + GIN indexes)
+    # 3. Full-Text Search (tsvector triggers + GIN indexes)
     # -----------------------------------------------------------------------
 
-    op.execute("""
-        ALTER TABLE projects ADD COLUMN search_vector tsvector
-        GENERATED ALWAYS AS (
-            setweight(to_tsvector('english', coalesce(name, '')), 'A') ||
-            setweight(to_tsvector('english', coalesce(description, '')), 'B')
-        ) STORED
-    """)
+    # Projects and tasks get frequent updates that don't touch their text (stage,
+    # status); a trigger limited to the text columns rebuilds the vector only
+    # when they are written, where a generated column is recomputed on every UPDATE.
+    # The search_vector columns themselves are declared in CREATE TABLE above
+    for table, title_col in FTS_TRIGGER_TABLES.items():
+        _create_fts_trigger(table, title_col)
     op.execute("CREATE INDEX idx_projects_fts ON projects USING GIN (search_vector)")
-
-    op.execute("""
-        ALTER TABLE tasks ADD COLUMN search_vector tsvector
-        GENERATED ALWAYS AS (
-            setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
-            setweight(to_tsvector('english', coalesce(description, '')), 'B')
-        ) STORED
-    """)
     op.execute("CREATE INDEX idx_tasks_fts ON tasks USING GIN (search_vector)")
 
-    # Messages FTS — added on the partitioned parent; PG propagates to partitions
-    op.execute("""
-        ALTER TABLE messages ADD COLUMN search_vector tsvector
-        GENERATED ALWAYS AS (
-            setweight(to_tsvector('english', coalesce(content, '')), 'B')
-        ) STORED
-    """)
-    op.execute("CREATE INDEX idx_messages_fts ON messages USING GIN (search_vector)")
+    # Messages FTS — an expression index rather than a stored column, so the heap
+    # stays narrow. 'simple' (no stemming) suits chat: code, mentions, mixed
+    # languages. Queries must use the same expression to hit the index:
+    #   to_tsvector('simple', content) @@ plainto_tsquery('simple', :q)
+    # Ingest is write-heavy: buffer new entries in a larger GIN pending list
+    # (merged into the index in bulk by vacuum) and vacuum the partitions more
+    # often so the list stays short for searches
+    op.execute(
+        "CREATE INDEX idx_messages_fts ON messages USING GIN (to_tsvector('simple', content)) "
+        f"WITH (fastupdate = on, gin_pending_list_limit = {MESSAGES_GIN_PENDING_LIST_KB})"
+    )
+    _set_partition_options("messages", "autovacuum_vacuum_scale_factor = 0.02")
 
     # -----------------------------------------------------------------------
     # 4. Event immutability trigger
     # -----------------------------------------------------------------------
 
+    # Row-level, so Postgres clones it onto every partition (including ones
+    # created later) and it also fires for UPDATE/DELETE aimed at a partition.
     op.execute("""
         CREATE OR REPLACE FUNCTION prevent_event_mutation()
         RETURNS TRIGGER AS $$
@@ -505,14 +707,18 @@ def upgrade() -> None:
     # 5. Row Level Security (RLS) policies
     # -----------------------------------------------------------------------
 
-    for table in RLS_TABLES:
-        op.execute(f"ALTER TABLE {table} ENABLE ROW LEVEL SECURITY")
-        op.execute(f"""
+    # FORCE applies the policy to the table owner too (superusers still bypass
+    # RLS). All tables are handled in one DO block, i.e. a single round trip.
+    rls_sql = "".join(
+        f"""
+            ALTER TABLE {table} ENABLE ROW LEVEL SECURITY, FORCE ROW LEVEL SECURITY;
             CREATE POLICY org_isolation ON {table}
-            USING (org_id = current_setting('app.current_org_id')::uuid)
-        """)
-        # Allow the table owner (migration runner / superuser) to bypass RLS
-        op.execute(f"ALTER TABLE {table} FORCE ROW LEVEL SECURITY")
+                AS PERMISSIVE FOR ALL
+                USING ({RLS_ORG_PREDICATE})
+                WITH CHECK ({RLS_ORG_PREDICATE});"""
+        for table in RLS_TABLES
+    )
+    op.execute(f"DO $$ BEGIN{rls_sql}\n    END $$")
 
 
 # ---------------------------------------------------------------------------
@@ -521,20 +727,49 @@ def upgrade() -> None:
 
 
 def downgrade() -> None:
-    # Drop RLS policies
-    for table in reversed(RLS_TABLES):
-        op.execute(f"DROP POLICY IF EXISTS org_isolation ON {table}")
-        op.execute(f"ALTER TABLE {table} DISABLE ROW LEVEL SECURITY")
+    # Drop RLS policies, mirroring upgrade: one DO block for all tables
+    rls_sql = "".join(
+        f"""
+            DROP POLICY IF EXISTS org_isolation ON {table};
+            ALTER TABLE {table} DISABLE ROW LEVEL SECURITY, NO FORCE ROW LEVEL SECURITY;"""
+        for table in reversed(RLS_TABLES)
+    )
+    op.execute(f"DO $$ BEGIN{rls_sql}\n    END $$")
 
     # Drop event immutability
     op.execute("DROP TRIGGER IF EXISTS events_immutable ON events")
     op.execute("DROP FUNCTION IF EXISTS prevent_event_mutation()")
 
-    # Drop FTS indexes and columns
+    # Drop FTS indexes and triggers
     op.execute("DROP INDEX IF EXISTS idx_messages_fts")
     op.execute("DROP INDEX IF EXISTS idx_tasks_fts")
     op.execute("DROP INDEX IF EXISTS idx_projects_fts")
-    # Generated columns can't be dropped easily; dropping tables handles it.
+    for table in FTS_TRIGGER_TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_search_vector ON {table}")
+        op.execute(f"DROP FUNCTION IF EXISTS {table}_search_vector_update()")
+    # search_vector columns go with their tables.
+
+    # Unregister from pg_partman (if used) so maintenance skips the dropped tables
+    partman_parents = ", ".join(f"'public.{table}'" for table in PARTITIONED_TABLES)
+    op.execute(f"""
+        DO $$
+        DECLARE
+            tmpl text;
+        BEGIN
+            IF to_regclass('partman.part_config') IS NOT NULL THEN
+                FOR tmpl IN
+                    DELETE FROM partman.part_config
+                    WHERE parent_table IN ({partman_parents})
+                    RETURNING template_table
+                LOOP
+                    IF tmpl IS NOT NULL THEN
+                        EXECUTE format('DROP TABLE IF EXISTS %s', tmpl);
+                    END IF;
+                END LOOP;
+            END IF;
+        END
+        $$
+    """)
 
     # Drop partitioned tables (cascade drops partitions)
     op.drop_table("events")
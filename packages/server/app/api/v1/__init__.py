@@ -11,20 +11,28 @@ from .organizations import router_scoped as orgs_scoped_router
 
 router = APIRouter()
 
+# Routes are matched in registration order, so the hottest paths come first:
+# the org-scoped resources (channel messages above all) ahead of org management.
+# No two routers share a path, so the order only affects matching cost.
+
+# Resource routers share one /orgs/{orgSlug} prefix, declared once
+org_scoped = APIRouter()
+# Note: Sub-agent POCs used {org_slug}, updating to {orgSlug} to match spec.
+org_scoped.include_router(channels.router, prefix="/channels", tags=["Channels"])
+org_scoped.include_router(tasks.router, prefix="/tasks", tags=["Tasks"])
+org_scoped.include_router(events.router, prefix="/events", tags=["Events"])
+org_scoped.include_router(projects.router, prefix="/projects", tags=["Projects"])
+org_scoped.include_router(users.router, prefix="/users", tags=["Users"])
+
+router.include_router(org_scoped, prefix="/orgs/{orgSlug}")
+
 # Organization routes (non-org-scoped: list, create)
 router.include_router(orgs_global_router)
 
 # Organization routes (org-scoped: get, update, delete, reactivate)
+# (its routes have an empty path, so it needs a non-empty prefix of its own)
 router.include_router(orgs_scoped_router, prefix="/orgs/{orgSlug}", tags=["Organizations"])
 
-# Include resource routers
-# Note: Sub-agent POCs used {org_slug}, updating to {orgSlug} to match spec.
-router.include_router(projects.router, prefix="/orgs/{orgSlug}/projects", tags=["Projects"])
-router.include_router(tasks.router, prefix="/orgs/{orgSlug}/tasks", tags=["Tasks"])
-router.include_router(events.router, prefix="/orgs/{orgSlug}/events", tags=["Events"])
-router.include_router(channels.router, prefix="/orgs/{orgSlug}/channels", tags=["Channels"])
-router.include_router(users.router, prefix="/orgs/{orgSlug}/users", tags=["Users"])
-
 
 @router.get("/", tags=["API"])
 async def api_root():
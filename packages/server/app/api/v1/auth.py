@@ -9,21 +9,28 @@ Authentication endpoints.
 from __future__ import annotations
 
 import uuid
+from functools import lru_cache
+from typing import Annotated
 
 import structlog
 from fastapi import APIRouter, Depends, HTTPException, Response, Request
-from pydantic import BaseModel, EmailStr
+from pydantic import AfterValidator, BaseModel, Field
+from pydantic.networks import validate_email
+from sqlalchemy import Executable, func, insert, literal, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 
 from app.core.auth import (
+    DUMMY_PASSWORD_HASH,
+    consume_jwt,
     create_jwt,
     decode_jwt,
     generate_csrf_token,
-    hash_password,
-    is_jwt_revoked,
+    hash_password_async,
+    password_needs_rehash,
     revoke_jwt,
-    verify_password,
+    verify_password_async,
 )
 from app.core.config import get_settings
 from app.core.database import get_session
@@ -35,27 +42,25 @@ log = structlog.get_logger()
 settings = get_settings()
 router = APIRouter()
 
-# Cookie config
-COOKIE_KWARGS = {
-    "httponly": True,
-    "secure": not settings.debug,  # allow non-HTTPS in dev
-    "samesite": "lax",
-    "path": "/",
-    "max_age": settings.jwt_expire_minutes * 60,
-}
+# Cookie config. The attribute string is fixed for the process, so each
+# Set-Cookie header is preformatted at import and completed with one
+# concatenation, instead of going through SimpleCookie in set_cookie() per call.
+# Both values are cookie-safe as-is (JWT and token_urlsafe alphabets).
+_COOKIE_ATTRS = f"; Max-Age={settings.jwt_expire_minutes * 60}; Path=/; SameSite=lax" + (
+    "" if settings.debug else "; Secure"  # allow non-HTTPS in dev
+)
+_SESSION_COOKIE_PREFIX = "mc_session="
+_SESSION_COOKIE_SUFFIX = "; HttpOnly" + _COOKIE_ATTRS
+_CSRF_COOKIE_PREFIX = "mc_csrf="  # Not HttpOnly: JS must read this
 
 
 def _set_session_cookies(response: Response, token: str, csrf: str) -> None:
     """Set the session JWT and CSRF cookies on a response."""
-    response.set_cookie(key="mc_session", value=token, **COOKIE_KWARGS)
-    response.set_cookie(
-        key="mc_csrf",
-        value=csrf,
-        httponly=False,  # JS must read this
-        secure=not settings.debug,
-        samesite="lax",
-        path="/",
-        max_age=settings.jwt_expire_minutes * 60,
+    response.raw_headers.append(
+        (b"set-cookie", f"{_SESSION_COOKIE_PREFIX}{token}{_SESSION_COOKIE_SUFFIX}".encode())
+    )
+    response.raw_headers.append(
+        (b"set-cookie", f"{_CSRF_COOKIE_PREFIX}{csrf}{_COOKIE_ATTRS}".encode())
     )
 
 
@@ -64,14 +69,37 @@ def _set_session_cookies(response: Response, token: str, csrf: str) -> None:
 # ---------------------------------------------------------------------------
 
 
+async def _execute_registration(session: AsyncSession, statement: Executable) -> None:
+    """Insert the new user's rows; a lost race for the same email is a 409, not a 500."""
+    try:
+        await session.execute(statement)
+    except IntegrityError as exc:
+        if "idx_users_email" in str(exc.orig):
+            raise HTTPException(status_code=409, detail="Email already registered") from exc
+        raise
+
+
+@lru_cache(maxsize=8192)
+def _normalize_email(value: str) -> str:
+    """EmailStr's validation and normalization, memoized: credential-stuffing floods
+    resend the same addresses, and the full check costs ~70us per request."""
+    return validate_email(value)[1]
+
+
+# Same validation, normalized value and OpenAPI schema as EmailStr
+CachedEmailStr = Annotated[
+    str, AfterValidator(_normalize_email), Field(json_schema_extra={"format": "email"})
+]
+
+
 class RegisterRequest(BaseModel):
-    email: EmailStr
+    email: CachedEmailStr
     password: str
     display_name: str
 
 
 class LoginRequest(BaseModel):
-    email: EmailStr
+    email: CachedEmailStr
     password: str
 
 
@@ -88,69 +116,98 @@ async def register(
     session: AsyncSession = Depends(get_session),
 ):
     """Register a new user with email/password. Creates a default org in single-tenant mode."""
-    # Check if email already exists
-    result = await session.execute(select(User).where(User.email == body.email))
-    if result.scalar_one_or_none():
+    single_tenant = settings.deployment_mode == "single-tenant"
+
+    # One round trip for every lookup registration needs: is the email taken (an
+    # EXISTS probe on idx_users_email, no row fetched) and, in single-tenant mode,
+    # the default org's id and whether it has an admin yet
+    email_taken = select(User.id).where(User.email == body.email).exists()
+    if single_tenant:
+        default_org_id = (
+            select(Organization.id).where(Organization.slug == "default").scalar_subquery()
+        )
+        has_admin = (
+            select(UserOrg.user_id)
+            .where(UserOrg.org_id == default_org_id, UserOrg.role == "administrator")
+            .exists()
+        )
+        result = await session.execute(select(email_taken, default_org_id, has_admin))
+        is_taken, org_id, org_has_admin = result.one()
+    else:
+        is_taken = (await session.execute(select(email_taken))).scalar_one()
+
+    if is_taken:
         raise HTTPException(status_code=409, detail="Email already registered")
 
     # Validate password strength (basic)
     if len(body.password) < 8:
         raise HTTPException(status_code=400, detail="Password must be at least 8 characters")
 
-    user = User(
-        id=uuid.uuid4(),
-        email=body.email,
-        type="human",
-        password_hash=hash_password(body.password),
+    user_id = uuid.uuid4()
+    # All of registration's rows go in one statement: the user INSERT is a CTE
+    # that the membership INSERT selects from (as is the org's, when creating it).
+    # Timestamps are SQL now(): the models' Python-side defaults can't be bound
+    # inside a CTE
+    new_user = (
+        insert(User)
+        .values(
+            id=user_id,
+            email=body.email,
+            type="human",
+            password_hash=await hash_password_async(body.password),
+            created_at=func.now(),
+        )
+        .returning(User.id)
     )
-    session.add(user)
 
     # In single-tenant mode, auto-create a default org or add to existing
-    if settings.deployment_mode == "single-tenant":
-        result = await session.execute(select(Organization).where(Organization.slug == "default"))
-        org = result.scalar_one_or_none()
-        if not org:
-            org = Organization(
-                id=uuid.uuid4(),
-                name="Default Organization",
-                slug="default",
-                status="active",
-                settings={},
+    if single_tenant:
+        new_user_cte = new_user.cte("new_user")
+        if org_id is None:
+            org_id = uuid.uuid4()
+            new_org_cte = (
+                insert(Organization)
+                .values(
+                    id=org_id,
+                    name="Default Organization",
+                    slug="default",
+                    status="active",
+                    settings={},
+                    created_at=func.now(),
+                    updated_at=func.now(),
+                )
+                .returning(Organization.id)
+                .cte("new_org")
             )
-            session.add(org)
+            membership_source = select(new_user_cte.c.id, new_org_cte.c.id)
             role = "administrator"  # First user is admin
         else:
-            # Check if there are any admins
-            result = await session.execute(
-                select(UserOrg).where(UserOrg.org_id == org.id, UserOrg.role == "administrator")
-            )
-            role = "administrator" if not result.scalars().first() else "contributor"
-
-        user_org = UserOrg(
-            user_id=user.id,
-            org_id=org.id,
-            role=role,
-            display_name=body.display_name,
+            membership_source = select(new_user_cte.c.id, literal(org_id, User.id.type))
+            role = "contributor" if org_has_admin else "administrator"
+
+        await _execute_registration(
+            session,
+            insert(UserOrg).from_select(
+                ["user_id", "org_id", "role", "display_name"],
+                membership_source.add_columns(literal(role), literal(body.display_name)),
+            ),
         )
-        session.add(user_org)
-
-        await session.flush()
 
         # Issue JWT
         token, _jti = create_jwt(
-            user_id=user.id,
-            org_ids=[str(org.id)],
-            active_org=str(org.id),
+            user_id=user_id,
+            org_ids=[str(org_id)],
+            active_org=str(org_id),
             role=role,
         )
         csrf = generate_csrf_token()
         _set_session_cookies(response, token, csrf)
     else:
-        await session.flush()
+        await _execute_registration(session, new_user)
 
-    log.info("user.registered", user_id=str(user.id), email=body.email)
+    log.info("user.registered", user_id=str(user_id), email=body.email)
     return AuthResponse(
-        user_id=str(user.id),
+        user_id=str(user_id),
         email=body.email,
         message="Registration successful",
     )
@@ -163,28 +220,42 @@ async def login(
     session: AsyncSession = Depends(get_session),
 ):
     """Authenticate with email/password and receive a JWT session."""
-    result = await session.execute(select(User).where(User.email == body.email))
-    user = result.scalar_one_or_none()
+    # Credentials and org memberships in one round trip: one row per membership
+    # (a single row with NULL org_id when there are none). Only the columns login
+    # needs; idx_users_email covers the users side
+    result = await session.execute(
+        select(User.id, User.password_hash, UserOrg.org_id, UserOrg.role)
+        .join(UserOrg, UserOrg.user_id == User.id, isouter=True)
+        .where(User.email == body.email)
+    )
+    rows = result.all()
 
-    if not user or not user.password_hash:
+    if not rows or not rows[0].password_hash:
+        # Spend the same hashing time as a wrong password: no timing oracle for emails
+        await verify_password_async(body.password, DUMMY_PASSWORD_HASH)
         raise HTTPException(status_code=401, detail="Invalid email or password")
+    user_id, password_hash = rows[0].id, rows[0].password_hash
 
-    if not verify_password(body.password, user.password_hash):
+    if not await verify_password_async(body.password, password_hash):
         log.warning("auth.login_failure", email=body.email, reason="bad_password")
         raise HTTPException(status_code=401, detail="Invalid email or password")
 
-    # Get user's org memberships
-    result = await session.execute(select(UserOrg).where(UserOrg.user_id == user.id))
-    user_orgs = result.scalars().all()
+    # Upgrade legacy bcrypt (or outdated Argon2) hashes while the password is at hand
+    if password_needs_rehash(password_hash):
+        await session.execute(
+            update(User)
+            .where(User.id == user_id)
+            .values(password_hash=await hash_password_async(body.password))
+        )
 
-    if not user_orgs:
+    first_uo = rows[0]
+    if first_uo.org_id is None:
         raise HTTPException(status_code=403, detail="User has no organization memberships")
 
-    first_uo = user_orgs[0]
-    org_ids = [str(uo.org_id) for uo in user_orgs]
+    org_ids = [str(row.org_id) for row in rows]
 
     token, _jti = create_jwt(
-        user_id=user.id,
+        user_id=user_id,
         org_ids=org_ids,
         active_org=str(first_uo.org_id),
         role=first_uo.role,
@@ -192,9 +263,9 @@ async def login(
     csrf = generate_csrf_token()
     _set_session_cookies(response, token, csrf)
 
-    log.info("auth.login_success", user_id=str(user.id), email=body.email)
+    log.info("auth.login_success", user_id=str(user_id), email=body.email)
     return AuthResponse(
-        user_id=str(user.id),
+        user_id=str(user_id),
         email=body.email,
         message="Login successful",
     )
@@ -262,11 +333,7 @@ async def oidc_callback(
 
 
 @router.post("/refresh")
-async def refresh_session(
-    request: Request,
-    response: Response,
-    session: AsyncSession = Depends(get_session),
-):
+async def refresh_session(request: Request, response: Response):
     """Refresh the current JWT session by issuing a new token."""
     token = request.cookies.get("mc_session")
     if not token:
@@ -277,11 +344,12 @@ async def refresh_session(
     except Exception:
         raise HTTPException(status_code=401, detail="Invalid or expired session")
 
+    # Revoke the old token, failing if it already was: one Redis round trip, and
+    # a token refreshed twice concurrently yields only one new session
     jti = payload.get("jti")
-    if jti and await is_jwt_revoked(jti):
+    if jti and not await consume_jwt(jti):
         raise HTTPException(status_code=401, detail="Session has been revoked")
 
-    # Issue new JWT, revoke old one
     new_token, new_jti = create_jwt(
         user_id=uuid.UUID(payload["sub"]),
         org_ids=payload["org_ids"],
@@ -289,9 +357,6 @@ async def refresh_session(
         role=payload["role"],
     )
 
-    if jti:
-        await revoke_jwt(jti)
-
     csrf = generate_csrf_token()
     _set_session_cookies(response, new_token, csrf)
 
@@ -11,14 +11,20 @@ Supports:
 
 from __future__ import annotations
 
+import asyncio
+import os
 import secrets
+import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional
 
 import bcrypt
 import jwt
 import structlog
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
 from fastapi import Depends, HTTPException, Request, WebSocket, Query
 from fastapi.security import APIKeyHeader
 from sqlalchemy import text
@@ -43,14 +49,54 @@ api_key_header = APIKeyHeader(name="Authorization", auto_error=False)
 # ---------------------------------------------------------------------------
 
 
+# Argon2id with the OWASP baseline parameters (19 MiB, 2 passes, 1 lane)
+_password_hasher = PasswordHasher(time_cost=2, memory_cost=19456, parallelism=1)
+
+# Hashing is CPU-bound C code that releases the GIL; the async wrappers run it
+# here so concurrent logins spread across cores instead of blocking the event loop
+_hash_pool = ThreadPoolExecutor(max_workers=os.cpu_count() or 1, thread_name_prefix="pwhash")
+
+
+# Verified against when a login names no account, so that path costs one Argon2
+# verification like every other and its timing doesn't reveal which emails exist.
+# The password is random and discarded: nothing can ever match it.
+DUMMY_PASSWORD_HASH = _password_hasher.hash(secrets.token_urlsafe(32))
+
+
+def _is_bcrypt_hash(hashed: str) -> bool:
+    return hashed.startswith("$2")
+
+
 def hash_password(password: str) -> str:
-    """Hash a password using bcrypt with cost factor 12."""
-    return bcrypt.hashpw(password.encode(), bcrypt.gensalt(rounds=12)).decode()
+    """Hash a password using Argon2id."""
+    return _password_hasher.hash(password)
 
 
 def verify_password(password: str, hashed: str) -> bool:
-    """Verify a password against a bcrypt hash."""
-    return bcrypt.checkpw(password.encode(), hashed.encode())
+    """Verify a password against an Argon2id hash (or a legacy bcrypt hash)."""
+    if _is_bcrypt_hash(hashed):
+        return bcrypt.checkpw(password.encode(), hashed.encode())
+    try:
+        return _password_hasher.verify(hashed, password)
+    except (VerificationError, InvalidHashError):
+        return False
+
+
+def password_needs_rehash(hashed: str) -> bool:
+    """True for bcrypt hashes and Argon2 hashes made with outdated parameters."""
+    return _is_bcrypt_hash(hashed) or _password_hasher.check_needs_rehash(hashed)
+
+
+async def hash_password_async(password: str) -> str:
+    """``hash_password`` on the hashing pool, off the event loop."""
+    return await asyncio.get_running_loop().run_in_executor(_hash_pool, hash_password, password)
+
+
+async def verify_password_async(password: str, hashed: str) -> bool:
+    """``verify_password`` on the hashing pool, off the event loop."""
+    return await asyncio.get_running_loop().run_in_executor(
+        _hash_pool, verify_password, password, hashed
+    )
 
 
 # ---------------------------------------------------------------------------
@@ -100,6 +146,14 @@ def parse_api_key(key: str) -> tuple[str, str, str]:
 # JWT
 # ---------------------------------------------------------------------------
 
+# Sessions are signed with the shared secret (HS256 by default); built once
+# rather than per call
+_JWT_KEY = settings.secret_key.encode()
+_JWT_ALGORITHMS = [settings.jwt_algorithm]
+# Every session token carries these; reject any that doesn't
+_JWT_DECODE_OPTIONS = {"require": ["exp", "jti", "sub"]}
+_JWT_DEFAULT_TTL = timedelta(minutes=settings.jwt_expire_minutes)
+
 
 def create_jwt(
     user_id: uuid.UUID,
@@ -111,8 +165,9 @@ def create_jwt(
 ) -> tuple[str, str]:
     """Create a signed JWT. Returns (token, jti)."""
     jti = str(uuid.uuid4())
-    now = datetime.utcnow()
-    exp = now + (expires_delta or timedelta(minutes=settings.jwt_expire_minutes))
+    # Integer epoch seconds: the form JWT stores, so PyJWT has no datetimes to convert
+    now = int(time.time())
+    exp = now + int((expires_delta or _JWT_DEFAULT_TTL).total_seconds())
     payload = {
         "sub": str(user_id),
         "org_ids": org_ids,
@@ -122,13 +177,13 @@ def create_jwt(
         "exp": exp,
         "jti": jti,
     }
-    token = jwt.encode(payload, settings.secret_key, algorithm=settings.jwt_algorithm)
+    token = jwt.encode(payload, _JWT_KEY, algorithm=settings.jwt_algorithm)
     return token, jti
 
 
 def decode_jwt(token: str) -> dict:
     """Decode and verify a JWT. Raises jwt.PyJWTError on failure."""
-    return jwt.decode(token, settings.secret_key, algorithms=[settings.jwt_algorithm])
+    return jwt.decode(token, _JWT_KEY, algorithms=_JWT_ALGORITHMS, options=_JWT_DECODE_OPTIONS)
 
 
 # ---------------------------------------------------------------------------
@@ -142,6 +197,16 @@ async def revoke_jwt(jti: str, ttl_seconds: int = 3600) -> None:
     await redis.setex(f"jwt:revoked:{jti}", ttl_seconds, "1")
 
 
+async def consume_jwt(jti: str, ttl_seconds: int = 3600) -> bool:
+    """Revoke a JWT ID unless it already is; True if this call revoked it.
+
+    Check and revoke are one atomic Redis SET NX, so a token can be exchanged
+    only once even when concurrent requests race to use it.
+    """
+    redis = await get_redis()
+    return bool(await redis.set(f"jwt:revoked:{jti}", "1", ex=ttl_seconds, nx=True))
+
+
 async def is_jwt_revoked(jti: str) -> bool:
     """Check if a JWT ID has been revoked."""
     redis = await get_redis()
@@ -184,6 +249,15 @@ async def _resolve_org(org_slug: str, session: AsyncSession) -> Organization:
     return org
 
 
+async def _set_org_context(org: Organization, session: AsyncSession) -> None:
+    """Set the RLS org context (app.current_org_id) for the rest of this connection's session."""
+    # set_config() takes the value as a bind parameter, unlike SET
+    await session.execute(
+        text("SELECT set_config('app.current_org_id', :org_id, false)"),
+        {"org_id": str(org.id)},
+    )
+
+
 async def _authenticate_jwt(
     token: str, org: Organization, session: AsyncSession
 ) -> AuthenticatedUser:
@@ -299,8 +373,7 @@ async def get_authenticated_user(
     """Main authentication dependency. Tries API key first, then JWT cookie."""
     org = await _resolve_org(orgSlug, session)
 
-    # Set RLS org context (must use text() with f-string, not parameters)
-    await session.execute(text(f"SET app.current_org_id = '{str(org.id)}'"))
+    await _set_org_context(org, session)
     # Try API key auth (agents)
     if authorization and authorization.startswith("Bearer "):
         key = authorization[7:].strip()
@@ -327,8 +400,7 @@ async def get_authenticated_user_ws(
 ) -> AuthenticatedUser:
     """WebSocket authentication dependency."""
     org = await _resolve_org(orgSlug, session)
-    # Set RLS org context (must use text() with f-string, not parameters)
-    await session.execute(text(f"SET app.current_org_id = '{str(org.id)}'"))
+    await _set_org_context(org, session)
 
     # Try query param (agents)
     if token and token.startswith("mc_ak_"):
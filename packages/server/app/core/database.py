@@ -17,6 +17,12 @@ engine = create_async_engine(
     settings.database_url,
     echo=settings.debug,
     future=True,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_recycle=settings.db_pool_recycle_seconds,
+    # asyncpg: the app's queries are short OLTP lookups, where JIT compilation
+    # costs more than it saves
+    connect_args={"server_settings": {"jit": "off"}},
 )
 
 async_session_factory = sessionmaker(
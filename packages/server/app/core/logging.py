@@ -0,0 +1,34 @@
+"""Structured logging configuration."""
+
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+import orjson
+import structlog
+
+
+def configure_logging(level: str = "info", fmt: str = "json") -> None:
+    """Configure structlog with the specified level and format.
+
+    Lines below ``level`` are dropped by the bound logger itself, before any
+    event dict is built; JSON lines are serialized by orjson straight to bytes.
+    """
+    processors: list[structlog.typing.Processor] = [
+        structlog.processors.add_log_level,
+        structlog.processors.TimeStamper(fmt="iso", utc=True, key="ts"),
+    ]
+    if fmt == "json":
+        processors.append(structlog.processors.JSONRenderer(serializer=orjson.dumps))
+        logger_factory: Any = structlog.BytesLoggerFactory()
+    else:
+        processors.append(structlog.dev.ConsoleRenderer(timestamp_key="ts"))
+        logger_factory = structlog.PrintLoggerFactory()
+
+    structlog.configure(
+        processors=processors,
+        wrapper_class=structlog.make_filtering_bound_logger(logging.getLevelName(level.upper())),
+        logger_factory=logger_factory,
+        cache_logger_on_first_use=True,
+    )
@@ -9,6 +9,7 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.core.config import get_settings
+from app.core.logging import configure_logging
 from app.core.middleware import CSRFMiddleware, SecurityHeadersMiddleware
 from app.core.redis import close_redis
 from app.api.v1 import router as api_v1_router
@@ -20,6 +21,8 @@ log = structlog.get_logger()
 
 def create_app() -> FastAPI:
     """Create and configure the FastAPI application."""
+    configure_logging(settings.log_level, settings.log_format)
+
     app = FastAPI(
         title="Mission Control",
         description="Coordination hub for OpenClaw agents and human teams.",
@@ -40,12 +43,13 @@ def create_app() -> FastAPI:
         allow_headers=["Content-Type", "Authorization", "X-CSRF-Token"],
     )
 
+    # API routes (registered first: routes are matched in order and these carry
+    # most of the traffic)
+    app.include_router(api_v1_router, prefix="/api/v1")
+
     # Auth routes (not org-scoped)
     app.include_router(auth_router, prefix="/auth", tags=["Authentication"])
 
-    # API routes
-    app.include_router(api_v1_router, prefix="/api/v1")
-
     @app.get("/health", tags=["System"])
     async def health_check():
         """Health check endpoint for liveness probes."""
@@ -29,6 +29,5 @@ class UUIDMixin(SQLModel):
     id: uuid.UUID = Field(
         default_factory=uuid.uuid4,
         primary_key=True,
-        index=True,
         nullable=False,
     )
@@ -10,7 +10,7 @@ from sqlmodel import Field, SQLModel
 class Channel(SQLModel, table=True):
     __tablename__ = "channels"
 
-    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True, index=True)
+    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     org_id: uuid.UUID = Field(foreign_key="organizations.id", nullable=False, index=True)
     project_id: Optional[uuid.UUID] = Field(default=None, foreign_key="projects.id", index=True)
     name: str = Field(nullable=False)
@@ -1,4 +1,4 @@
-"""Event model (partitioned by month on timestamp, RLS-scoped, immutable)."""
+"""Event model (hash-partitioned on org_id, then by month on timestamp; RLS-scoped, immutable)."""
 
 from datetime import datetime
 from typing import Optional
@@ -11,7 +11,7 @@ from sqlmodel import Field, SQLModel
 
 class Event(SQLModel, table=True):
     __tablename__ = "events"
-    __table_args__ = ({"postgresql_partition_by": "RANGE (timestamp)"},)
+    __table_args__ = ({"postgresql_partition_by": "HASH (org_id)"},)
 
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     sequence_id: Optional[int] = Field(
@@ -19,7 +19,8 @@ class Event(SQLModel, table=True):
         index=True,
         sa_column_kwargs={"server_default": sa.text("nextval('events_sequence_id_seq')")},
     )  # auto-populated by DB sequence
-    org_id: uuid.UUID = Field(foreign_key="organizations.id", nullable=False, index=True)
+    # Part of the primary key: it is the partition key
+    org_id: uuid.UUID = Field(foreign_key="organizations.id", primary_key=True, index=True)
     type: str = Field(nullable=False)  # e.g., task.transitioned, project.created
     actor_id: Optional[uuid.UUID] = Field(default=None, foreign_key="users.id")
     actor_type: str = Field(nullable=False)  # human | agent | system
@@ -1,4 +1,4 @@
-"""Message model (partitioned by month on created_at, RLS-scoped)."""
+"""Message model (hash-partitioned on channel_id, RLS-scoped)."""
 
 from datetime import datetime
 from typing import List
@@ -11,20 +11,26 @@ from sqlmodel import Field, SQLModel
 
 class Message(SQLModel, table=True):
     __tablename__ = "messages"
-    __table_args__ = ({"postgresql_partition_by": "RANGE (created_at)"},)
+    # Composite indexes lead with org_id to cover the RLS predicate (see migration 0001)
+    __table_args__ = (
+        sa.Index("idx_messages_channel", "org_id", "channel_id", sa.text("created_at DESC")),
+        sa.Index("idx_messages_sender", "org_id", "sender_id", sa.text("created_at DESC")),
+        {"postgresql_partition_by": "HASH (channel_id)"},
+    )
 
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
-    org_id: uuid.UUID = Field(foreign_key="organizations.id", nullable=False, index=True)
-    channel_id: uuid.UUID = Field(foreign_key="channels.id", nullable=False, index=True)
-    sender_id: uuid.UUID = Field(foreign_key="users.id", nullable=False, index=True)
-    content: str = Field(nullable=False)
-    mentions: List[uuid.UUID] = Field(
-        default_factory=list,
-        sa_column=sa.Column(ARRAY(UUID(as_uuid=True)), server_default="{}"),
-    )
+    org_id: uuid.UUID = Field(foreign_key="organizations.id", nullable=False)
+    channel_id: uuid.UUID = Field(foreign_key="channels.id", primary_key=True)
+    sender_id: uuid.UUID = Field(foreign_key="users.id", nullable=False)
+    # Column order matches the migration: fixed-width columns before variable-length ones
     created_at: datetime = Field(
         default_factory=lambda: datetime.utcnow(),
-        primary_key=True,
+        nullable=False,
         sa_column_kwargs={"server_default": "now()"},
         sa_type=sa.DateTime(timezone=True),
     )
+    content: str = Field(nullable=False)
+    mentions: List[uuid.UUID] = Field(
+        default_factory=list,
+        sa_column=sa.Column(ARRAY(UUID(as_uuid=True)), server_default="{}"),
+    )
@@ -11,7 +11,7 @@ from sqlmodel import Field, SQLModel
 class SubAgent(SQLModel, table=True):
     __tablename__ = "sub_agents"
 
-    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True, index=True)
+    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     org_id: uuid.UUID = Field(foreign_key="organizations.id", nullable=False, index=True)
     task_id: uuid.UUID = Field(foreign_key="tasks.id", nullable=False)
     model: str = Field(nullable=False)
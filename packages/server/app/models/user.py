@@ -11,13 +11,22 @@ from .base import UUIDMixin
 
 class User(UUIDMixin, SQLModel, table=True):
     __tablename__ = "users"
+    # Unique on email, covering login's columns (see migration 0001)
+    __table_args__ = (
+        sa.Index(
+            "idx_users_email",
+            "email",
+            unique=True,
+            postgresql_include=["id", "password_hash"],
+        ),
+    )
 
-    email: Optional[str] = Field(default=None, unique=True, index=True)
+    email: Optional[str] = Field(default=None)
     type: str = Field(nullable=False)  # human | agent
     identifier: Optional[str] = None
     oidc_provider: Optional[str] = None
     oidc_subject: Optional[str] = None
-    password_hash: Optional[str] = Field(default=None)  # bcrypt hash for email/password login
+    password_hash: Optional[str] = Field(default=None)  # Argon2id hash for email/password login
     created_at: datetime = Field(
         default_factory=lambda: datetime.utcnow(),
         nullable=False,
@@ -31,7 +31,7 @@ INSERT INTO organizations (
 
 -- Insert the Admin User
 -- Email: admin@example.com
--- Password: password (hashed with bcrypt via passlib)
+-- Password: password (legacy bcrypt hash; rehashed to Argon2id on first login)
 INSERT INTO users (
     id, 
     email, 
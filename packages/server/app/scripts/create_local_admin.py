@@ -7,7 +7,6 @@ import argparse
 import sys
 
 import uuid
-from passlib.context import CryptContext
 from sqlmodel import select
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
@@ -20,16 +19,11 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../.
 from app.models.user import User
 from app.models.organization import Organization
 from app.models.user_org import UserOrg
+from app.core.auth import hash_password
 from app.core.config import get_settings
 
 settings = get_settings()
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
-
-def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
-
 
 async def create_user(email: str, password: str):
     engine = create_async_engine(str(settings.database_url))
@@ -61,7 +55,7 @@ async def create_user(email: str, password: str):
                 id=uuid.uuid4(),
                 email=email,
                 type="human",
-                password_hash=get_password_hash(password),
+                password_hash=hash_password(password),
             )
             session.add(user)
             print(f"Created user: {email}")
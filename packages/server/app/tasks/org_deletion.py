@@ -14,6 +14,7 @@ from sqlmodel import select
 from app.core.database import get_session_context
 from app.models.organization import Organization
 from app.services.organizations import finalize_org_deletion
+from app.tasks.partition_maintenance import run_partition_maintenance
 
 log = structlog.get_logger()
 
@@ -48,7 +49,7 @@ async def finalize_pending_deletions(ctx: dict) -> int:
 class WorkerSettings:
     """ARQ worker configuration."""
 
-    functions = [finalize_pending_deletions]
+    functions = [finalize_pending_deletions, run_partition_maintenance]
     cron_jobs = [
         # Run every hour
         {
@@ -56,4 +57,10 @@ class WorkerSettings:
             "hour": None,  # every hour
             "minute": 0,
         },
+        # Keep pg_partman's premade partitions ahead of the clock
+        {
+            "coroutine": run_partition_maintenance,
+            "hour": None,  # every hour
+            "minute": 30,
+        },
     ]
@@ -0,0 +1,33 @@
+"""
+ARQ background task: provision upcoming monthly partitions via pg_partman.
+
+Scheduled to run periodically (e.g., every hour). A no-op on databases where
+migration 0001 fell back to fixed partitions because pg_partman is unavailable.
+"""
+
+from __future__ import annotations
+
+import structlog
+from sqlalchemy import text
+
+from app.core.database import get_session_context
+
+log = structlog.get_logger()
+
+
+async def run_partition_maintenance(ctx: dict) -> bool:
+    """Run pg_partman maintenance for all registered parent tables.
+
+    Returns True if maintenance ran, False if pg_partman is not installed.
+    """
+    async with get_session_context() as session:
+        installed = await session.execute(
+            text("SELECT 1 FROM pg_extension WHERE extname = 'pg_partman'")
+        )
+        if installed.scalar() is None:
+            return False
+        # run_maintenance() (not the _proc variant) is safe inside the session's transaction
+        await session.execute(text("SELECT partman.run_maintenance()"))
+
+    log.info("partition_maintenance.completed")
+    return True
@@ -18,11 +18,13 @@ import uuid
 from datetime import timedelta
 from unittest.mock import AsyncMock, patch
 
+import bcrypt
 import pytest
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
 
 from app.core.auth import (
+    DUMMY_PASSWORD_HASH,
     AuthenticatedUser,
     create_jwt,
     decode_jwt,
@@ -30,12 +32,15 @@ from app.core.auth import (
     generate_csrf_token,
     hash_api_key,
     hash_password,
+    hash_password_async,
     parse_api_key,
+    password_needs_rehash,
     require_admin,
     require_contributor,
     require_member,
     verify_api_key,
     verify_password,
+    verify_password_async,
 )
 from app.core.middleware import CSRFMiddleware, SecurityHeadersMiddleware, SECURITY_HEADERS
 
@@ -57,13 +62,37 @@ class TestPasswordHashing:
         assert not verify_password("wrong-password", hashed)
 
     def test_different_hashes_for_same_password(self):
-        """bcrypt uses random salt, so hashes differ."""
+        """Argon2 uses random salt, so hashes differ."""
         h1 = hash_password("same")
         h2 = hash_password("same")
         assert h1 != h2
         assert verify_password("same", h1)
         assert verify_password("same", h2)
 
+    def test_hash_is_argon2id(self):
+        hashed = hash_password("pw")
+        assert hashed.startswith("$argon2id$")
+        assert not password_needs_rehash(hashed)
+
+    def test_legacy_bcrypt_hash_verifies_and_needs_rehash(self):
+        legacy = bcrypt.hashpw(b"old-password", bcrypt.gensalt(rounds=4)).decode()
+        assert verify_password("old-password", legacy)
+        assert not verify_password("other", legacy)
+        assert password_needs_rehash(legacy)
+
+    def test_malformed_hash_fails(self):
+        assert not verify_password("pw", "not-a-hash")
+
+    def test_dummy_hash_never_matches(self):
+        assert DUMMY_PASSWORD_HASH.startswith("$argon2id$")
+        assert not verify_password("", DUMMY_PASSWORD_HASH)
+        assert not verify_password("password", DUMMY_PASSWORD_HASH)
+
+    async def test_async_wrappers(self):
+        hashed = await hash_password_async("pw")
+        assert await verify_password_async("pw", hashed)
+        assert not await verify_password_async("nope", hashed)
+
 
 # ---------------------------------------------------------------------------
 # Unit Tests: API Key
@@ -311,6 +340,61 @@ class TestAuthEndpoints:
         assert resp.json()["message"] == "Logged out"
 
 
+class TestLoginEmail:
+    def test_matches_email_str(self):
+        """The cached validator normalizes exactly like EmailStr and rejects the same input."""
+        from pydantic import BaseModel, EmailStr, ValidationError
+
+        from app.api.v1.auth import LoginRequest
+
+        class Reference(BaseModel):
+            email: EmailStr
+
+        raw = "Some.User@Example.COM"
+        assert LoginRequest(email=raw, password="x").email == Reference(email=raw).email
+        with pytest.raises(ValidationError):
+            LoginRequest(email="not-an-email", password="x")
+
+
+class TestSessionCookies:
+    def test_headers_match_set_cookie(self):
+        """The preformatted headers equal what Starlette's set_cookie would emit."""
+        from fastapi import Response
+
+        from app.api.v1.auth import _set_session_cookies
+        from app.core.config import get_settings
+
+        settings = get_settings()
+        max_age = settings.jwt_expire_minutes * 60
+        expected = Response()
+        expected.set_cookie(
+            key="mc_session",
+            value="a.b-c_d",
+            httponly=True,
+            secure=not settings.debug,
+            samesite="lax",
+            path="/",
+            max_age=max_age,
+        )
+        expected.set_cookie(
+            key="mc_csrf",
+            value="csrf-token",
+            httponly=False,
+            secure=not settings.debug,
+            samesite="lax",
+            path="/",
+            max_age=max_age,
+        )
+
+        response = Response()
+        _set_session_cookies(response, "a.b-c_d", "csrf-token")
+
+        def cookies(r):
+            return [v for k, v in r.raw_headers if k == b"set-cookie"]
+
+        assert cookies(response) == cookies(expected)
+
+
 # ---------------------------------------------------------------------------
 # Unit Tests: Role-based auth matrix
 # ---------------------------------------------------------------------------
@@ -407,3 +491,15 @@ class TestJWTRevocation:
 
             result = await is_jwt_revoked("non-existent-jti")
             assert result is False
+
+    @pytest.mark.asyncio
+    async def test_consume_jwt_only_once(self):
+        mock_redis = AsyncMock()
+        mock_redis.set = AsyncMock(side_effect=[True, None])
+
+        with patch("app.core.auth.get_redis", return_value=mock_redis):
+            from app.core.auth import consume_jwt
+
+            assert await consume_jwt("test-jti-456") is True
+            assert await consume_jwt("test-jti-456") is False
+            mock_redis.set.assert_called_with("jwt:revoked:test-jti-456", "1", ex=3600, nx=True)
@@ -173,8 +173,8 @@ async def test_rls_insert_wrong_org_blocked(seeded_pool):
             proj_id,
             ORG_A,
         )
-        # FORCE ROW LEVEL SECURITY makes the USING clause act as a WITH CHECK
-        # for inserts too, so a mismatched org_id is rejected outright.
+        # The policy's WITH CHECK applies to inserts too (FORCE ROW LEVEL SECURITY
+        # covers the table owner), so a mismatched org_id is rejected outright.
         proj_id2 = uuid.uuid4()
         with pytest.raises(asyncpg.exceptions.InsufficientPrivilegeError):
             await conn.execute(
@@ -259,6 +259,32 @@ async def test_event_delete_blocked(seeded_pool):
             )
 
 
+async def test_event_delete_via_partition_blocked(seeded_pool):
+    """DELETE aimed directly at an events partition should also be rejected."""
+    async with seeded_pool.acquire() as conn:
+        event_id = uuid.uuid4()
+        now = datetime.now(timezone.utc)
+        await conn.execute(
+            """INSERT INTO events (id, org_id, type, actor_type, payload, timestamp)
+               VALUES ($1, $2, 'test.partition_delete', 'system', '{}', $3)""",
+            event_id,
+            ORG_A,
+            now,
+        )
+        partition = await conn.fetchval(
+            "SELECT tableoid::regclass::text FROM events WHERE id = $1 AND timestamp = $2",
+            event_id,
+            now,
+        )
+        assert partition != "events"
+        with pytest.raises(asyncpg.exceptions.RaiseError, match="immutable"):
+            await conn.execute(
+                f"DELETE FROM {partition} WHERE id = $1 AND timestamp = $2",
+                event_id,
+                now,
+            )
+
+
 # ---------------------------------------------------------------------------
 # Partition Tests
 # ---------------------------------------------------------------------------